@@ -0,0 +1,120 @@
+import math
+import pygame
+from sprites import SpriteLoader
+
+PLAYER_SPRITES = {
+    'Yellow': 'pacman_yellow.png',
+    'Green': 'pacman_green.png',
+    'Pink': 'pacman_pink.png',
+}
+GHOST_SPRITES = {
+    'blinky': 'ghost_red.png',
+    'pinky': 'ghost_pink.png',
+    'inky': 'ghost_blue.png',
+    'clyde': 'ghost_orange.png',
+}
+PLAYER_COLOR = (255,255,0)
+# One mouth cycle is ~19 frames (the old 30 + 20*sin(frame/3) degrees), sampled once per frame
+MOUTH_PERIOD = 19
+MOUTH_ANGLES = [30 + 20*math.sin(2*math.pi*i/MOUTH_PERIOD) for i in range(MOUTH_PERIOD)]
+# Ghost bob of int(4*sin(frame/6)) pixels over ~38 frames
+WOBBLE_PERIOD = 38
+WOBBLE = [int(4*math.sin(2*math.pi*i/WOBBLE_PERIOD)) for i in range(WOBBLE_PERIOD)]
+MAX_WOBBLE = 4
+FRIGHTENED_COLORS = [(0,128,255), (255,255,255)]
+KEY = (0,0,0)
+
+_player = {}
+_ghost = {}
+_ghost_sprite = {}
+
+
+def _blank(w, h):
+    surf = pygame.Surface((w, h))
+    surf.fill(KEY)
+    surf.set_colorkey(KEY, pygame.RLEACCEL)
+    return surf
+
+
+def _mouth_frame(cell, angle, rot):
+    surf = _blank(cell, cell)
+    c = cell / 2
+    pygame.draw.circle(surf, PLAYER_COLOR, (cell//2, cell//2), cell//2-2)
+    # Cut the mouth out as a wedge of the colorkey
+    reach = cell
+    wedge = [(c, c)]
+    for a in (-angle, 0, angle):
+        r = math.radians(a + rot)
+        wedge.append((c + reach*math.cos(r), c - reach*math.sin(r)))
+    pygame.draw.polygon(surf, KEY, wedge)
+    return surf
+
+
+def player_frames(cell, skin='Yellow'):
+    # {dir: [frame, ...]}; index with anim_frame % len(frames)
+    key = (cell, skin)
+    frames = _player.get(key)
+    if frames is None:
+        sprite = SpriteLoader().load(PLAYER_SPRITES.get(skin, 'pacman_yellow.png'), (cell, cell))
+        if sprite:
+            # The sprite faces right: flip for left so it stays upright, rotate for up/down
+            frames = {
+                (1,0): [sprite],
+                (-1,0): [pygame.transform.flip(sprite, True, False)],
+                (0,-1): [pygame.transform.rotate(sprite, 90)],
+                (0,1): [pygame.transform.rotate(sprite, -90)],
+            }
+        else:
+            frames = {d: [_mouth_frame(cell, angle, rot) for angle in MOUTH_ANGLES]
+                      for d, rot in (((1,0), 0), ((0,-1), 90), ((-1,0), 180), ((0,1), 270))}
+        frames[(0,0)] = frames[(1,0)]
+        _player[key] = frames
+    return frames
+
+
+class GhostFrames:
+    # Frames are cell x (cell + 2*MAX_WOBBLE) with the bob already applied; blit at y - MAX_WOBBLE
+    def __init__(self, cell):
+        self.cell = cell
+        self.eyes = [self._eyes(w) for w in range(-MAX_WOBBLE, MAX_WOBBLE+1)]
+        self.frightened = [[self._body(color, w) for w in range(-MAX_WOBBLE, MAX_WOBBLE+1)]
+                           for color in FRIGHTENED_COLORS]
+        self.bodies = {}
+
+    def _body(self, color, wobble):
+        cell = self.cell
+        surf = _blank(cell, cell + 2*MAX_WOBBLE)
+        pygame.draw.circle(surf, color, (cell//2, cell//2 + MAX_WOBBLE + wobble), cell//2-2)
+        return surf
+
+    def _eyes(self, wobble):
+        cell = self.cell
+        surf = self._body((255,255,255), wobble)
+        cy = cell//2 + MAX_WOBBLE + wobble
+        # Sized for the 32 px cell (pupils 6 px off centre, radius 4) and scaled from there
+        apart = cell*6 // 32
+        radius = max(1, cell // 8)
+        pygame.draw.circle(surf, (0,128,255), (cell//2-apart, cy), radius)
+        pygame.draw.circle(surf, (0,128,255), (cell//2+apart, cy), radius)
+        return surf
+
+    def body(self, color):
+        frames = self.bodies.get(color)
+        if frames is None:
+            frames = self.bodies[color] = [self._body(color, w) for w in range(-MAX_WOBBLE, MAX_WOBBLE+1)]
+        return frames
+
+
+def ghost_sprite(cell, ghost_type):
+    # The PNG body for a normal ghost, or None; ghost_frames() covers the rest and any missing PNG
+    key = (cell, ghost_type)
+    if key not in _ghost_sprite:
+        _ghost_sprite[key] = SpriteLoader().load(GHOST_SPRITES.get(ghost_type, 'ghost_red.png'), (cell, cell))
+    return _ghost_sprite[key]
+
+
+def ghost_frames(cell):
+    frames = _ghost.get(cell)
+    if frames is None:
+        frames = _ghost[cell] = GhostFrames(cell)
+    return frames
@@ -0,0 +1,44 @@
+import random
+import sys
+
+from gcwatch import percentile
+
+DIRS = [(1,0),(-1,0),(0,1),(0,-1)]
+
+
+class Autopilot:
+    # Wanders the maze so benchmark runs exercise eating, power-ups and deaths
+    def __init__(self, seed=0):
+        self.rng = random.Random(seed)
+
+    def step(self, game):
+        player = game.player
+        if (player.fx, player.fy) != (float(player.x), float(player.y)) and player.dir != (0, 0):
+            return
+        options = [d for d in DIRS if game.map.is_walkable(player.x + d[0], player.y + d[1])]
+        forward = [d for d in options if d != (-player.dir[0], -player.dir[1])]
+        if forward:
+            options = forward
+        if options:
+            player.next_dir = self.rng.choice(options)
+
+
+class BenchRun:
+    def __init__(self, frames):
+        self.frames = frames
+        self.frame_times = []
+
+    def record(self, secs):
+        self.frame_times.append(secs)
+
+    def done(self):
+        return len(self.frame_times) >= self.frames
+
+    def report(self, out=None):
+        out = out or sys.stderr
+        times = self.frame_times
+        if not times:
+            return
+        print(f'[bench] {len(times)} frames, mean {sum(times)/len(times)*1000:.2f} ms, '
+              f'p50 {percentile(times, 0.5)*1000:.2f} ms, p99 {percentile(times, 0.99)*1000:.2f} ms, '
+              f'max {max(times)*1000:.2f} ms', file=out)
@@ -0,0 +1,144 @@
+import argparse
+import random
+import time
+from collections import deque
+
+import mazegen
+from level import CompiledLevel, compile_level
+
+
+def bfs_step(level, start, target):
+    # What a ghost ran on every tile before the junction graph
+    queue = deque([(start, [])])
+    visited = set()
+    while queue:
+        cell, path = queue.popleft()
+        if cell == target and path:
+            return path[0]
+        for nxt in level.neighbors[cell]:
+            if nxt not in visited:
+                visited.add(nxt)
+                queue.append((nxt, path + [nxt]))
+    return None
+
+
+def graph_step(level, pos, direction, target):
+    graph = level.junctions
+    if not graph.is_node(pos):
+        back = (pos[0] - direction[0], pos[1] - direction[1])
+        a, b = level.neighbors[pos]
+        if back in (a, b):
+            return (b if back == a else a), False
+    return graph.next_step(pos, target), True
+
+
+def reachable(level, start):
+    seen = {start}
+    queue = deque([start])
+    while queue:
+        for nxt in level.neighbors[queue.popleft()]:
+            if nxt not in seen:
+                seen.add(nxt)
+                queue.append(nxt)
+    return seen
+
+
+def run(level, step, seconds, seed=0):
+    rng = random.Random(seed)
+    cells = sorted(reachable(level, level.player_start))
+    pos, direction = level.player_start, (0, 0)
+    target = rng.choice(cells)
+    steps = searches = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        if steps % 40 == 0 or pos == target:
+            target = rng.choice(cells)
+        nxt, searched = step(level, pos, direction, target)
+        searches += searched
+        if nxt is None:
+            nxt = rng.choice(level.neighbors[pos])
+        direction = (nxt[0] - pos[0], nxt[1] - pos[1])
+        pos = nxt
+        steps += 1
+    return steps / (time.perf_counter() - start), searches / max(1, steps)
+
+
+def ghost_load(level, count, frames, budget=None, seed=0):
+    # Per-frame ghost AI time for `count` ghosts chasing a wandering player; budget=None is the old all-at-once update
+    import os
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    import pygame
+    from types import SimpleNamespace
+    from bench import Autopilot
+    from ghost import Ghost, GHOST_TYPES
+    from map import GameMap
+    from player import Player
+    from scheduler import GhostScheduler
+    if not pygame.display.get_surface():
+        pygame.display.init()
+        pygame.display.set_mode((1, 1))
+    random.seed(seed)
+    game_map = GameMap(level=level, cell_size=4)
+    player = Player(game_map)
+    pilot = Autopilot(seed)
+    ghosts = []
+    for i in range(count):
+        name, color = GHOST_TYPES[i % len(GHOST_TYPES)]
+        ghosts.append(Ghost(game_map, color, speed=15, ghost_type=name, blinky_ref=ghosts[0] if ghosts else None))
+    scheduler = GhostScheduler(budget) if budget is not None else None
+    if scheduler:
+        scheduler.stagger(ghosts)
+    state = SimpleNamespace(player=player, map=game_map)
+    times = []
+    for _ in range(frames):
+        pilot.step(state)
+        player.update()
+        start = time.perf_counter()
+        if scheduler:
+            scheduler.update(ghosts, player)
+        else:
+            for ghost in ghosts:
+                ghost.update(player)
+        times.append(time.perf_counter() - start)
+    return times, scheduler
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='bench_ai', description='Compare per-tile BFS with junction-graph ghost steering')
+    parser.add_argument('levels', nargs='*', default=['levels/level1.json'])
+    parser.add_argument('--size', action='append', default=[], metavar='WxH',
+                        help='also run on a generated maze of this size (repeatable)')
+    parser.add_argument('--seconds', type=float, default=2.0)
+    parser.add_argument('--ghosts', type=int, action='append', default=[], metavar='N',
+                        help='instead, compare per-frame ghost AI time with and without the scheduler (repeatable)')
+    parser.add_argument('--budget', type=float, default=1.0, metavar='MS', help='scheduler budget for --ghosts')
+    parser.add_argument('--frames', type=int, default=1800)
+    args = parser.parse_args(argv)
+    mazes = [compile_level(path) for path in args.levels]
+    for size in args.size:
+        w, h = (int(v) for v in size.lower().split('x'))
+        mazes.append(CompiledLevel(f'<generated {w}x{h}>', {'grid': mazegen.generate(w, h, seed=0)}))
+    if args.ghosts:
+        from gcwatch import percentile
+        for level in mazes:
+            for count in args.ghosts:
+                before, _ = ghost_load(level, count, args.frames)
+                after, scheduler = ghost_load(level, count, args.frames, args.budget / 1000)
+                stats = scheduler.stats()
+                print(f'{level.path}, {count} ghosts: all at once p99 {percentile(before, 0.99)*1000:.3f} ms '
+                      f'max {max(before)*1000:.3f} ms | scheduled p99 {percentile(after, 0.99)*1000:.3f} ms '
+                      f'max {max(after)*1000:.3f} ms, {stats["total_deferred"]} deferred')
+        return
+    for level in mazes:
+        nodes = len(level.junctions.nodes)
+        tiles = len(level.walkable)
+        bfs_rate, _ = run(level, lambda *a: (bfs_step(a[0], a[1], a[3]), True), args.seconds)
+        graph_rate, searched = run(level, graph_step, args.seconds)
+        print(f'{level.path}: {tiles} tiles, {nodes} junctions')
+        print(f'  bfs every tile  {bfs_rate:12,.0f} steps/s')
+        print(f'  junction graph  {graph_rate:12,.0f} steps/s  '
+              f'({searched:.0%} of steps search, {graph_rate/bfs_rate:.1f}x)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,180 @@
+import os
+import queue
+import shutil
+import struct
+import subprocess
+import sys
+import threading
+import time
+
+import pygame
+
+# index, width, height of the raw RGB frame that follows on a worker's stdin
+HEADER = struct.Struct('<III')
+
+
+def _read_exact(stream, n):
+    data = bytearray()
+    while len(data) < n:
+        chunk = stream.read(n - len(data))
+        if not chunk:
+            return None
+        data += chunk
+    return bytes(data)
+
+
+def encode_worker(out_dir):
+    # A separate interpreter started on this file: PNG compression holds the GIL for tens of ms
+    # per frame, so it must not run in the game process. Acks each saved frame with one byte.
+    stdin, stdout = sys.stdin.buffer, sys.stdout.buffer
+    while True:
+        header = _read_exact(stdin, HEADER.size)
+        if header is None:
+            break
+        index, w, h = HEADER.unpack(header)
+        data = _read_exact(stdin, w * h * 3)
+        if data is None:
+            break
+        path = os.path.join(out_dir, f'frame_{index:06d}.png')
+        pygame.image.save(pygame.image.frombuffer(data, (w, h), 'RGB'), path)
+        stdout.write(b'.')
+        stdout.flush()
+
+
+class FrameCapture:
+    def __init__(self, out_dir, size, every=1, slots=8, fmt='png', fps=60, workers=2, report_every=5.0):
+        self.out_dir = out_dir
+        self.size = size
+        self.every = max(1, every)
+        self.fmt = fmt
+        self.captured = 0
+        self.encoded = 0
+        self.dropped = 0
+        self.oldest_pending = None
+        self.report_every = report_every
+        self.last_report = time.perf_counter()
+        self.free = queue.Queue()
+        self.filled = queue.Queue()
+        for _ in range(slots):
+            self.free.put(pygame.Surface(size))
+        os.makedirs(out_dir, exist_ok=True)
+        self.proc = None
+        self.workers = []
+        self.ack_threads = []
+        self.count_lock = threading.Lock()
+        if fmt == 'ffmpeg':
+            if shutil.which('ffmpeg'):
+                self.proc = subprocess.Popen(
+                    ['ffmpeg', '-loglevel', 'error', '-y', '-f', 'rawvideo', '-pix_fmt', 'rgb24',
+                     '-s', f'{size[0]}x{size[1]}', '-r', str(fps), '-i', '-',
+                     '-pix_fmt', 'yuv420p', os.path.join(out_dir, 'capture.mp4')],
+                    stdin=subprocess.PIPE)
+            else:
+                print('[capture] ffmpeg not found, writing PNG frames instead', file=sys.stderr)
+                self.fmt = 'png'
+        if self.fmt == 'png':
+            # Fresh interpreters running only this module: no fork of the threaded SDL process,
+            # and unlike multiprocessing's spawn they never re-import main.py
+            for _ in range(max(1, workers)):
+                # stdout carries the acks, so keep pygame's import banner off it
+                env = dict(os.environ, PYGAME_HIDE_SUPPORT_PROMPT='1')
+                proc = subprocess.Popen([sys.executable, os.path.abspath(__file__), out_dir],
+                                        stdin=subprocess.PIPE, stdout=subprocess.PIPE, env=env)
+                reader = threading.Thread(target=self._count_acks, args=(proc.stdout,), daemon=True)
+                reader.start()
+                self.workers.append(proc)
+                self.ack_threads.append(reader)
+        self.thread = threading.Thread(target=self._encode_loop, daemon=True)
+        self.thread.start()
+
+    def capture(self, screen, frame):
+        if frame % self.every:
+            return
+        try:
+            slot = self.free.get_nowait()
+        except queue.Empty:
+            # Never wait on the encoder from the game loop
+            self.dropped += 1
+            return
+        if screen.get_size() != slot.get_size():
+            if self.proc:
+                # A video stream has a fixed frame size
+                pygame.transform.scale(screen, slot.get_size(), slot)
+            else:
+                # The window was resized: each ring slot is reallocated once, here or by the encoder
+                self.size = screen.get_size()
+                slot = pygame.Surface(self.size)
+        if screen.get_size() == slot.get_size():
+            slot.blit(screen, (0, 0))
+        now = time.perf_counter()
+        self.filled.put((slot, self.captured, now))
+        self.captured += 1
+        if self.report_every and now - self.last_report >= self.report_every:
+            self.last_report = now
+            self.report()
+
+    def _count_acks(self, stream):
+        while stream.read(1):
+            with self.count_lock:
+                self.encoded += 1
+
+    def _encode_loop(self):
+        turn = 0
+        while True:
+            item = self.filled.get()
+            if item is None:
+                break
+            slot, index, stamp = item
+            self.oldest_pending = stamp
+            data = pygame.image.tobytes(slot, 'RGB')
+            size = slot.get_size()
+            if slot.get_size() != self.size:
+                slot = pygame.Surface(self.size)
+            self.free.put(slot)
+            if self.proc:
+                self.proc.stdin.write(data)
+                with self.count_lock:
+                    self.encoded += 1
+            else:
+                # Round-robin; a busy worker's full pipe blocks this thread, never the game loop
+                worker = self.workers[turn % len(self.workers)]
+                turn += 1
+                worker.stdin.write(HEADER.pack(index, *size))
+                worker.stdin.write(data)
+                worker.stdin.flush()
+            self.oldest_pending = None
+
+    def stats(self):
+        pending = self.filled.qsize()
+        lag = time.perf_counter() - self.oldest_pending if self.oldest_pending else 0.0
+        return {
+            'captured': self.captured,
+            'encoded': self.encoded,
+            'dropped': self.dropped,
+            'backlog': pending,
+            'lag_ms': lag * 1000,
+        }
+
+    def report(self, label='status'):
+        s = self.stats()
+        print(f"[capture] {label}: {s['captured']} captured, {s['encoded']} encoded, "
+              f"{s['dropped']} dropped, {s['backlog']} queued, encoder {s['lag_ms']:.0f} ms behind",
+              file=sys.stderr)
+        return s
+
+    def close(self):
+        self.filled.put(None)
+        self.thread.join()
+        for worker in self.workers:
+            worker.stdin.close()
+        for worker, reader in zip(self.workers, self.ack_threads):
+            worker.wait()
+            reader.join()
+        if self.proc:
+            self.proc.stdin.close()
+            self.proc.wait()
+        return self.report(f'finished ({self.out_dir})')
+
+
+if __name__ == '__main__':
+    encode_worker(sys.argv[1])
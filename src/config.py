@@ -0,0 +1,59 @@
+import argparse
+import os
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog='paxman')
+    parser.add_argument('--full-init', action='store_true',
+                        help='initialise every pygame module up front instead of only display and font')
+    parser.add_argument('--trace-startup', action='store_true',
+                        default=bool(os.environ.get('PAXMAN_TRACE_STARTUP')),
+                        help='print time spent per startup phase and per import')
+    parser.add_argument('--native-cell', type=int, default=0, metavar='PX',
+                        help='draw the playfield at this fixed cell size (e.g. 16 or 32) and upscale once per frame')
+    parser.add_argument('--upscale', choices=('integer', 'smooth'), default='integer',
+                        help='how the native playfield is scaled to the window')
+    parser.add_argument('--capture', metavar='DIR',
+                        help='record gameplay frames into DIR without blocking the game loop')
+    parser.add_argument('--capture-every', type=int, default=1, metavar='N',
+                        help='capture every Nth frame')
+    parser.add_argument('--capture-format', choices=('png', 'ffmpeg'), default='png',
+                        help='PNG sequence, or raw frames piped to a local ffmpeg')
+    parser.add_argument('--capture-slots', type=int, default=8, metavar='N',
+                        help='preallocated frame buffers; frames are dropped when all are queued')
+    parser.add_argument('--telemetry', metavar='DIR',
+                        help='write a compressed event stream for each run into DIR')
+    parser.add_argument('--gc-tune', action='store_true',
+                        help='freeze the heap after loading and defer full collections to level transitions and pauses')
+    parser.add_argument('--gc-report', action='store_true',
+                        help='report GC pauses and per-frame allocation on exit')
+    parser.add_argument('--alloc-budget', type=float, metavar='KB',
+                        help='trace allocations and exit non-zero if steady-state p99 per-frame allocation exceeds KB')
+    parser.add_argument('--bench', type=int, metavar='FRAMES',
+                        help='skip the menu, let an autopilot play uncapped for FRAMES frames, then report and exit')
+    parser.add_argument('--turn-buffer', type=int, default=0, metavar='FRAMES',
+                        help='frames a requested turn stays queued; 0 keeps it until it can be taken')
+    parser.add_argument('--measure-latency', action='store_true',
+                        help='report input-to-flip latency percentiles on exit')
+    parser.add_argument('--pipeline', action='store_true',
+                        help='simulate the next tick on a second thread while the current one is drawn')
+    parser.add_argument('--quality', choices=('auto', 'high', 'medium', 'low', 'minimal'), default='auto',
+                        help='effects tier; auto steps down when frames run over budget and back up with headroom')
+    parser.add_argument('--show-quality', action='store_true',
+                        help='start with the quality overlay visible (F3 toggles it)')
+    parser.add_argument('--instances', type=int, default=1, metavar='N',
+                        help='run N games side by side in one window, sharing level data, sprites and sound')
+    parser.add_argument('--humans', type=int, default=1, metavar='K',
+                        help='with --instances, the first K viewports are played from the keyboard '
+                             '(arrows, WASD, IJKL, keypad); the rest play themselves')
+    parser.add_argument('--ai-budget', type=float, default=1.0, metavar='MS',
+                        help='ghost decisions per frame stop after this long; the rest carry over to the next frame')
+    args = parser.parse_args(argv)
+    if args.instances > 1:
+        # The split-screen loop has no simulation thread, event stream, capture or latency probe
+        unsupported = [flag for flag, value in (('--pipeline', args.pipeline), ('--telemetry', args.telemetry),
+                                                 ('--capture', args.capture),
+                                                 ('--measure-latency', args.measure_latency)) if value]
+        if unsupported:
+            parser.error(f"{', '.join(unsupported)} cannot be combined with --instances")
+    return args
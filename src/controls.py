@@ -0,0 +1,90 @@
+import sys
+import time
+import pygame
+
+from gcwatch import percentile
+
+KEY_DIRS = {
+    pygame.K_UP: (0, -1),
+    pygame.K_DOWN: (0, 1),
+    pygame.K_LEFT: (-1, 0),
+    pygame.K_RIGHT: (1, 0),
+}
+# Split-screen players, in viewport order
+KEYMAPS = [
+    KEY_DIRS,
+    {pygame.K_w: (0, -1), pygame.K_s: (0, 1), pygame.K_a: (-1, 0), pygame.K_d: (1, 0)},
+    {pygame.K_i: (0, -1), pygame.K_k: (0, 1), pygame.K_j: (-1, 0), pygame.K_l: (1, 0)},
+    {pygame.K_KP8: (0, -1), pygame.K_KP5: (0, 1), pygame.K_KP4: (-1, 0), pygame.K_KP6: (1, 0)},
+]
+
+
+class InputSampler:
+    def __init__(self, measure=False):
+        self.measure = measure
+        self.order = []
+        self.pending = []
+        self.latencies = []
+        # When the first key press of this frame reached the event queue, seen while waiting
+        self.arrived = None
+        self.last_tick = time.perf_counter()
+
+    def on_event(self, event):
+        # pygame events carry no timestamp; wait() notes when a press arrived during the frame wait
+        if event.type == pygame.KEYDOWN and event.key in KEY_DIRS:
+            if event.key in self.order:
+                self.order.remove(event.key)
+            self.order.append(event.key)
+            if self.measure:
+                self.pending.append(self.arrived if self.arrived is not None else time.perf_counter())
+
+    def poll(self):
+        # Read the keyboard as late as possible, right before the simulation step
+        pygame.event.pump()
+        pressed = pygame.key.get_pressed()
+        self.order = [key for key in self.order if pressed[key]]
+        held = self.order[-1] if self.order else None
+        if held is None:
+            for key in KEY_DIRS:
+                if pressed[key]:
+                    held = key
+        return KEY_DIRS[held] if held is not None else None
+
+    def apply(self, player, direction):
+        if direction is not None and direction != player.next_dir:
+            player.request_turn(direction)
+
+    def wait(self, clock, fps):
+        # Stands in for clock.tick(fps). When measuring, it sleeps in short slices and watches the
+        # queue, so a key pressed during the wait is timed from when it arrived, not from the next poll.
+        if self.measure:
+            deadline = self.last_tick + 1/fps
+            now = time.perf_counter()
+            while now < deadline:
+                pygame.event.pump()
+                if self.arrived is None and pygame.event.peek(pygame.KEYDOWN):
+                    self.arrived = now
+                time.sleep(min(0.001, deadline - now))
+                now = time.perf_counter()
+            clock.tick()
+        else:
+            clock.tick(fps)
+        self.last_tick = time.perf_counter()
+
+    def presented(self, consumed=True):
+        self.arrived = None
+        if not self.pending:
+            return
+        if consumed:
+            now = time.perf_counter()
+            self.latencies.extend(now - t for t in self.pending)
+        self.pending.clear()
+
+    def report(self, out=None):
+        if not self.measure or not self.latencies:
+            return
+        out = out or sys.stderr
+        lat = self.latencies
+        print(f'[input] {len(lat)} inputs, press-to-flip p50 {percentile(lat, 0.5)*1000:.2f} ms, '
+              f'p90 {percentile(lat, 0.9)*1000:.2f} ms, p99 {percentile(lat, 0.99)*1000:.2f} ms, '
+              f'max {max(lat)*1000:.2f} ms', file=out)
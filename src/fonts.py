@@ -0,0 +1,38 @@
+import io
+import os
+import pygame
+
+FONT_PATH = 'assets/fonts/PressStart2P.ttf'
+
+_font_bytes = None
+_fonts = {}
+
+
+def _load_font_bytes():
+    global _font_bytes
+    if _font_bytes is None:
+        if os.path.exists(FONT_PATH):
+            with open(FONT_PATH, 'rb') as f:
+                _font_bytes = f.read()
+        else:
+            _font_bytes = b''
+    return _font_bytes
+
+
+def get_font(size, fallback_size=None):
+    key = ('ttf', size)
+    if key not in _fonts:
+        data = _load_font_bytes()
+        if data:
+            # Parse the TTF from memory so each size doesn't hit the disk again
+            _fonts[key] = pygame.font.Font(io.BytesIO(data), size)
+        else:
+            _fonts[key] = get_sysfont('Arial', fallback_size or size)
+    return _fonts[key]
+
+
+def get_sysfont(name, size):
+    key = (name, size)
+    if key not in _fonts:
+        _fonts[key] = pygame.font.SysFont(name, size)
+    return _fonts[key]
@@ -1,13 +1,20 @@
 import pygame
+import telemetry
 from player import Player
 from ghost import Ghost, GHOST_TYPES
 from map import GameMap
+from level import Campaign
 from ui import GameUI
 from sound import SoundManager
+from fonts import get_sysfont
+from render import RenderTarget
+from quality import QualityGovernor
+from scheduler import GhostScheduler
 import json
 import os
 import random
 import math
+import copy
 
 class Particle:
     def __init__(self, x, y, color, dx, dy, life):
@@ -22,7 +29,10 @@ class Particle:
         self.x += self.dx
         self.y += self.dy
         self.life -= 1
-    def draw(self, screen, ox, oy):
+    def draw(self, screen, ox, oy, fade=True):
+        if not fade:
+            pygame.draw.circle(screen, self.color, (ox + int(self.x) + 4, oy + int(self.y) + 4), 4)
+            return
         alpha = max(0, int(255 * self.life / self.max_life))
         surf = pygame.Surface((8,8), pygame.SRCALPHA)
         pygame.draw.circle(surf, self.color + (alpha,), (4,4), 4)
@@ -38,26 +48,47 @@ class ComboPopup:
     def update(self):
         self.y -= 1.2
         self.life -= 1
-    def draw(self, screen, ox, oy):
-        alpha = max(0, int(255 * self.life / self.max_life))
-        font = pygame.font.SysFont('Arial', 32)
+    def draw(self, screen, ox, oy, scale=1, fade=True):
+        font = get_sysfont('Arial', 32)
         surf = font.render(f'+{self.value}', True, (255,255,0))
-        surf.set_alpha(alpha)
-        screen.blit(surf, (ox + int(self.x), oy + int(self.y)))
+        if fade:
+            surf.set_alpha(max(0, int(255 * self.life / self.max_life)))
+        screen.blit(surf, (ox + int(self.x*scale), oy + int(self.y*scale)))
+
+class FrameSnapshot:
+    # Everything Game.draw reads, frozen at the end of one tick
+    __slots__ = ('tick', 'map', 'target', 'dots', 'powerups', 'dots_eaten', 'powerups_eaten',
+                 'player', 'ghosts', 'particles', 'combo_popups', 'fruit', 'shake', 'respawn_invuln',
+                 'score', 'lives', 'level', 'start_timer', 'game_over')
 
 class Game:
-    def __init__(self, screen, difficulty='Normal', skin='Yellow'):
+    def __init__(self, screen, difficulty='Normal', skin='Yellow', sounds=None,
+                 native_cell=0, smooth_upscale=False, events=None, campaign=None,
+                 turn_buffer=0, quality=None, ai_budget=0.001):
         self.screen = screen
+        self.scheduler = GhostScheduler(ai_budget)
+        self.quality = quality or QualityGovernor(forced='high')
+        self.turn_buffer = turn_buffer
+        self.events = events or telemetry.NullTelemetry()
+        self.frames = 0
+        self.level_frames = 0
+        # Set by a pipelined runner: eaten dots/power-ups are logged so snapshots carry only changes
+        self.record_changes = False
+        self.dot_log = []
+        self.powerup_log = []
+        self.map_fresh = True
+        self.native_cell = native_cell
+        self.smooth_upscale = smooth_upscale
+        self.target = None
         self.difficulty = difficulty
         self.skin = skin
         self.game_over = False
-        self.sounds = SoundManager()
-        self.ghost_speed = {'Easy': 30, 'Normal': 15, 'Hard': 8}[difficulty]
+        self.sounds = sounds or SoundManager()
         self.leaderboard_file = 'scores.json'
         self.leaderboard = self.load_leaderboard()
         self.saved_score = False
-        self.reset()
-        self.level = 1
+        self.campaign = campaign or Campaign()
+        self.restart()
 
     def load_leaderboard(self):
         if os.path.exists(self.leaderboard_file):
@@ -79,9 +110,25 @@ class Game:
         self.leaderboard = sorted(self.leaderboard, key=lambda x: x['score'], reverse=True)[:10]
         self.save_leaderboard()
 
+    def restart(self):
+        # A new run: level 1 at the difficulty's ghost speed; reset() alone keeps both
+        self.level = 1
+        self.level_frames = 0
+        self.ghost_speed = {'Easy': 30, 'Normal': 15, 'Hard': 8}[self.difficulty]
+        self.reset()
+
     def reset(self, keep_score=False):
-        self.map = GameMap()
-        self.player = Player(self.map, skin=self.skin)
+        level = self.campaign.load(self.level)
+        self.map = GameMap(level=level, cell_size=self.native_cell or 32)
+        # The next snapshot ships the new map whole; deltas logged against the old one must not follow it
+        self.map_fresh = True
+        self.dot_log = []
+        self.powerup_log = []
+        if self.native_cell:
+            self.target = RenderTarget(level.cols, level.rows, self.native_cell, self.smooth_upscale)
+        # Build the next level in the background while this one is played
+        self.campaign.prefetch(self.level + 1, self.map.cell_size)
+        self.player = Player(self.map, skin=self.skin, turn_buffer=self.turn_buffer)
         # Spawn ghosts: Blinky, Pinky, Inky, Clyde
         self.ghosts = []
         blinky = Ghost(self.map, GHOST_TYPES[0][1], speed=self.ghost_speed, ghost_type='blinky')
@@ -89,6 +136,7 @@ class Game:
         self.ghosts.append(Ghost(self.map, GHOST_TYPES[1][1], speed=self.ghost_speed, ghost_type='pinky'))
         self.ghosts.append(Ghost(self.map, GHOST_TYPES[2][1], speed=self.ghost_speed, ghost_type='inky', blinky_ref=blinky))
         self.ghosts.append(Ghost(self.map, GHOST_TYPES[3][1], speed=self.ghost_speed, ghost_type='clyde'))
+        self.scheduler.stagger(self.ghosts)
         if not keep_score:
             self.score = 0
             self.lives = 3
@@ -110,14 +158,16 @@ class Game:
         self.player.handle_event(event)
 
     def update(self):
+        self.frames += 1
+        self.level_frames += 1
+        self.events.frame = self.frames
         if hasattr(self, 'start_timer') and self.start_timer > 0:
             self.start_timer -= 1
             return
         if hasattr(self, 'respawn_invuln') and self.respawn_invuln > 0:
             self.respawn_invuln -= 1
         self.player.update()
-        for ghost in self.ghosts:
-            ghost.update(self.player)
+        self.scheduler.update(self.ghosts, self.player)
         # Fruit logic
         if self.fruit is None and self.dots_eaten == 30:
             # Spawn fruit at center
@@ -132,10 +182,13 @@ class Game:
         # Eat fruit
         if self.fruit and (self.player.x, self.player.y) == self.fruit:
             self.score += 300
+            self.events.emit(telemetry.FRUIT, self.player.x, self.player.y)
             self.spawn_particles(self.player.fx, self.player.fy, (255,0,0))
             self.fruit = None
         # Eat dot
         if self.map.eat_dot(self.player.x, self.player.y):
+            if self.record_changes:
+                self.dot_log.append((self.player.x, self.player.y))
             self.score += 10
             self.sounds.play_sfx('dot.wav')
             self.spawn_particles(self.player.fx, self.player.fy, (0,255,255))
@@ -149,20 +202,26 @@ class Game:
                 self.combo_popups.append(ComboPopup(self.player.fx*self.map.cell_size, self.player.fy*self.map.cell_size, self.combo_count*10))
                 self.score += (self.combo_count-1)*10
             self.dots_eaten += 1
+            self.events.emit(telemetry.DOT, self.player.x, self.player.y, self.combo_count)
         # Power-up collection
         kind = self.map.eat_powerup(self.player.x, self.player.y)
         if kind:
+            if self.record_changes:
+                self.powerup_log.append((self.player.x, self.player.y))
             self.player.apply_powerup(kind)
+            self.events.emit(telemetry.POWERUP, ord(kind), self.player.x, self.player.y)
             self.sounds.play_sfx('powerup.wav')
             self.spawn_particles(self.player.fx, self.player.fy, (255,0,255))
         if self.map.dots_left() == 0:
+            self.events.emit(telemetry.LEVEL_CLEAR, self.level, self.score, self.level_frames)
+            self.level_frames = 0
             self.level += 1
             self.ghost_speed = max(4, int(self.ghost_speed * 0.85))
             self.reset(keep_score=True)
             return
         # Collision check after all movement
         if not hasattr(self, 'respawn_invuln') or self.respawn_invuln == 0:
-            for ghost in self.ghosts:
+            for i, ghost in enumerate(self.ghosts):
                 dist = math.hypot(ghost.fx - self.player.fx, ghost.fy - self.player.fy)
                 if dist < 0.7:
                     if ghost.eaten:
@@ -170,12 +229,15 @@ class Game:
                     if self.player.is_invincible() and ghost.mode == 'frightened':
                         ghost.eaten = True
                         ghost.mode = 'eyes'
+                        self.events.emit(telemetry.GHOST_EATEN, i, ghost.x, ghost.y)
                         continue
                     if not self.player.is_invincible() and not ghost.eaten and ghost.mode != 'frightened':
                         self.lives -= 1
+                        self.events.emit(telemetry.DEATH, i, self.player.x, self.player.y)
                         if self.lives <= 0:
                             self.lives = 0
                             self.game_over = True
+                            self.events.emit(telemetry.GAME_OVER, self.score, self.level)
                         self.sounds.play_sfx('death.wav')
                         self.player.respawn()
                         self.spawn_particles(self.player.fx, self.player.fy, (255,0,0))
@@ -195,49 +257,113 @@ class Game:
         for c in self.combo_popups:
             c.update()
 
-    def draw(self):
+    def snapshot(self):
+        snap = FrameSnapshot()
+        snap.tick = self.frames
+        snap.map = self.map
+        snap.target = self.target
+        if self.map_fresh:
+            # New level: ship the full collectible state once, deltas afterwards
+            snap.dots = bytearray(self.map.dot_bits)
+            snap.powerups = dict(self.map.powerups)
+            self.map_fresh = False
+        else:
+            snap.dots = snap.powerups = None
+        snap.dots_eaten = self.dot_log
+        snap.powerups_eaten = self.powerup_log
+        self.dot_log = []
+        self.powerup_log = []
+        snap.player = copy.copy(self.player)
+        snap.ghosts = [copy.copy(g) for g in self.ghosts]
+        snap.particles = [copy.copy(p) for p in self.particles]
+        snap.combo_popups = [copy.copy(c) for c in self.combo_popups]
+        snap.fruit = self.fruit
+        snap.shake = self.shake
+        snap.respawn_invuln = self.respawn_invuln
+        snap.score = self.score
+        snap.lives = self.lives
+        snap.level = self.level
+        snap.start_timer = self.start_timer
+        snap.game_over = self.game_over
+        return snap
+
+    def draw(self, state=None):
+        # state is a FrameSnapshot when a simulation thread runs ahead; otherwise draw live
+        s = state or self
+        tier = self.quality.tier
         self.screen.fill((20, 20, 40))
-        map_w = len(self.map.grid[0]) * self.map.cell_size
-        map_h = len(self.map.grid) * self.map.cell_size
-        offset_x = (self.screen.get_width() - map_w) // 2
-        offset_y = (self.screen.get_height() - map_h) // 2
-        map_rect = pygame.Rect(offset_x, offset_y, map_w, map_h)
         # Screen shake
         sx = sy = 0
-        if hasattr(self, 'shake') and self.shake > 0:
-            sx = random.randint(-6,6)
-            sy = random.randint(-6,6)
-        self.map.draw(self.screen, (offset_x+sx, offset_y+sy))
-        # Flicker player if invulnerable
-        flicker = (not hasattr(self, 'respawn_invuln') or self.respawn_invuln == 0) or (self.respawn_invuln//8)%2 == 0
-        if flicker:
-            self.player.draw(self.screen, (offset_x+sx, offset_y+sy))
-        for ghost in self.ghosts:
-            ghost.draw(self.screen, (offset_x+sx, offset_y+sy), self.player)
-        for p in self.particles:
-            p.draw(self.screen, offset_x+sx, offset_y+sy)
-        for c in self.combo_popups:
-            c.draw(self.screen, offset_x+sx, offset_y+sy)
-        # Draw fruit
-        if self.fruit:
-            fx, fy = self.fruit
-            cell = self.map.cell_size
-            px = offset_x+sx + fx*cell
-            py = offset_y+sy + fy*cell
-            pygame.draw.circle(self.screen, (255,0,0), (px+cell//2, py+cell//2), cell//2-4)
+        if tier.shake and s.shake > 0:
+            amount = max(1, 6 * s.map.cell_size // 32) if s.target else 6
+            sx = random.randint(-amount, amount)
+            sy = random.randint(-amount, amount)
+        if s.target:
+            # Native mode: draw at the fixed cell size, then upscale once into the window
+            s.target.surface.fill((20, 20, 40))
+            self.draw_playfield(s.target.surface, sx, sy, s)
+            map_rect = s.target.layout(self.screen)
+            s.target.smooth = self.smooth_upscale and tier.smooth
+            s.target.present(self.screen)
+            for c in s.combo_popups if tier.popups else ():
+                c.draw(self.screen, map_rect.x, map_rect.y, s.target.scale, tier.alpha)
+        else:
+            map_w = len(s.map.grid[0]) * s.map.cell_size
+            map_h = len(s.map.grid) * s.map.cell_size
+            offset_x = (self.screen.get_width() - map_w) // 2
+            offset_y = (self.screen.get_height() - map_h) // 2
+            map_rect = pygame.Rect(offset_x, offset_y, map_w, map_h)
+            self.draw_playfield(self.screen, offset_x+sx, offset_y+sy, s)
+            for c in s.combo_popups if tier.popups else ():
+                c.draw(self.screen, offset_x+sx, offset_y+sy, fade=tier.alpha)
         # UI bar (arcade style)
-        high_score = max(self.score, max([e['score'] for e in self.leaderboard], default=0))
-        self.ui.draw(self.score, high_score, self.lives, map_rect, level=self.level)
+        high_score = max(s.score, max([e['score'] for e in self.leaderboard], default=0))
+        self.ui.draw(s.score, high_score, s.lives, map_rect, level=s.level)
         # READY/GAME OVER in center
-        if hasattr(self, 'start_timer') and self.start_timer > 0:
+        if hasattr(s, 'start_timer') and s.start_timer > 0:
             self.ui.draw_ready(map_rect)
-        if self.game_over:
+        if s.game_over:
             self.ui.draw_game_over(map_rect)
-        if self.game_over:
+        if s.game_over:
             self.draw_leaderboard()
 
+    def draw_playfield(self, surface, ox, oy, s=None):
+        s = s or self
+        tier = self.quality.tier
+        if s is self:
+            s.map.draw(surface, (ox, oy))
+        else:
+            s.map.draw(surface, (ox, oy), s.dots, s.powerups)
+        # Flicker player if invulnerable
+        flicker = (not hasattr(s, 'respawn_invuln') or s.respawn_invuln == 0) or (s.respawn_invuln//8)%2 == 0
+        if flicker:
+            s.player.draw(surface, (ox, oy))
+        for ghost in s.ghosts:
+            ghost.draw(surface, (ox, oy), s.player, tier.wobble)
+        for p in s.particles:
+            p.draw(surface, ox, oy, tier.alpha)
+        # Draw fruit
+        if s.fruit:
+            fx, fy = s.fruit
+            cell = s.map.cell_size
+            px = ox + fx*cell
+            py = oy + fy*cell
+            pygame.draw.circle(surface, (255,0,0), (px+cell//2, py+cell//2), max(1, cell//2-4))
+
+    def set_screen(self, surface):
+        # Viewports hand each game a subsurface of the shared window
+        self.screen = surface
+        self.ui.screen = surface
+        self.resize(*surface.get_size())
+
+    def resize(self, w, h):
+        if self.target:
+            self.target.layout(self.screen)
+        else:
+            self.map.set_cell_size(w, h)
+
     def draw_leaderboard(self):
-        font = pygame.font.SysFont('Arial', 32)
+        font = get_sysfont('Arial', 32)
         title = font.render('LEADERBOARD (Top 10)', True, (255,255,0))
         self.screen.blit(title, (self.screen.get_width()//2 - title.get_width()//2, 80))
         for i, entry in enumerate(self.leaderboard):
@@ -247,7 +373,7 @@ class Game:
 
     def spawn_particles(self, fx, fy, color):
         cell = self.map.cell_size
-        for _ in range(12):
+        for _ in range(self.quality.tier.particles):
             angle = random.uniform(0, 2*math.pi)
             speed = random.uniform(2, 5)
             dx = math.cos(angle) * speed
@@ -0,0 +1,123 @@
+import gc
+import sys
+import time
+import tracemalloc
+
+# Effectively never promote to a full collection on its own; safe_point() does it instead
+DEFERRED_GEN2_THRESHOLD = 1_000_000
+
+
+def percentile(values, q):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class FrameGC:
+    def __init__(self, tune=False, report=False, alloc_budget_kb=None, warmup=120):
+        self.tune = tune
+        self.report_enabled = report or alloc_budget_kb is not None
+        self.alloc_budget_kb = alloc_budget_kb
+        self.warmup = warmup
+        self.since_safe_point = 0
+        self.default_threshold = gc.get_threshold()
+        self.frozen = False
+        self.deferred = False
+        self.pauses = {0: [], 1: [], 2: []}
+        self.frame_pause = 0.0
+        self.frame_pauses = []
+        self.frame_alloc_kb = []
+        self.frame_blocks = []
+        self._gc_start = None
+        self._frame_blocks0 = 0
+        self._frame_mem0 = 0
+        if self.report_enabled:
+            gc.callbacks.append(self._on_gc)
+        if alloc_budget_kb is not None:
+            tracemalloc.start()
+
+    def _on_gc(self, phase, info):
+        if phase == 'start':
+            self._gc_start = time.perf_counter()
+        elif self._gc_start is not None:
+            secs = time.perf_counter() - self._gc_start
+            self.pauses[info['generation']].append(secs)
+            self.frame_pause += secs
+            self._gc_start = None
+
+    def assets_loaded(self):
+        if not self.tune:
+            return
+        gc.collect()
+        if not self.frozen:
+            # Only the first load is frozen: modules, fonts, decoded sprites and compiled levels live
+            # for the whole process. Games built later are collected normally once they're dropped.
+            gc.freeze()
+            self.frozen = True
+        self._defer()
+
+    def _defer(self):
+        gc.set_threshold(self.default_threshold[0], self.default_threshold[1], DEFERRED_GEN2_THRESHOLD)
+        self.deferred = True
+
+    def safe_point(self):
+        # Level transitions, pauses and game over: a full collection can't cause a visible hitch here
+        self.since_safe_point = 0
+        if not self.tune:
+            return
+        gc.collect()
+        # Normal thresholds until play resumes; end_frame defers full collections again
+        gc.set_threshold(*self.default_threshold)
+        self.deferred = False
+
+    def restore(self):
+        if self.tune:
+            gc.unfreeze()
+            gc.set_threshold(*self.default_threshold)
+            self.frozen = self.deferred = False
+
+    def begin_frame(self):
+        if not self.report_enabled:
+            return
+        self.frame_pause = 0.0
+        self._frame_blocks0 = sys.getallocatedblocks()
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+            self._frame_mem0 = tracemalloc.get_traced_memory()[0]
+
+    def end_frame(self, steady):
+        self.since_safe_point += 1
+        if self.tune and steady and not self.deferred:
+            self._defer()
+        if not self.report_enabled or not steady or self.since_safe_point <= self.warmup:
+            return
+        self.frame_pauses.append(self.frame_pause)
+        self.frame_blocks.append(sys.getallocatedblocks() - self._frame_blocks0)
+        if tracemalloc.is_tracing():
+            peak = tracemalloc.get_traced_memory()[1]
+            self.frame_alloc_kb.append((peak - self._frame_mem0) / 1024)
+
+    def over_budget(self):
+        if self.alloc_budget_kb is None or not self.frame_alloc_kb:
+            return False
+        return percentile(self.frame_alloc_kb, 0.99) > self.alloc_budget_kb
+
+    def report(self, out=None):
+        if not self.report_enabled:
+            return
+        out = out or sys.stderr
+        n = len(self.frame_pauses)
+        print(f'[gc] {n} steady-state frames', file=out)
+        for gen, pauses in self.pauses.items():
+            if pauses:
+                print(f'[gc]   gen{gen}: {len(pauses)} collections, p50 {percentile(pauses, 0.5)*1000:.3f} ms, '
+                      f'p99 {percentile(pauses, 0.99)*1000:.3f} ms, max {max(pauses)*1000:.3f} ms', file=out)
+        if n:
+            print(f'[gc]   per-frame GC pause p99 {percentile(self.frame_pauses, 0.99)*1000:.3f} ms, '
+                  f'net blocks/frame mean {sum(self.frame_blocks)/n:.1f}', file=out)
+        if self.frame_alloc_kb:
+            print(f'[gc]   per-frame allocation p50 {percentile(self.frame_alloc_kb, 0.5):.1f} KB, '
+                  f'p99 {percentile(self.frame_alloc_kb, 0.99):.1f} KB, max {max(self.frame_alloc_kb):.1f} KB', file=out)
+        if self.over_budget():
+            print(f'[gc]   FAIL: p99 allocation exceeds budget of {self.alloc_budget_kb:.1f} KB per frame', file=out)
@@ -1,8 +1,6 @@
-import pygame
 import random
 import math
-from sprites import SpriteLoader
-from collections import deque
+import animcache
 
 GHOST_TYPES = [
     ('blinky', (255,0,0)),
@@ -25,16 +23,8 @@ class Ghost:
         self.fx, self.fy = float(self.x), float(self.y)
         self.color = color
         self.dir = random.choice([(1,0),(-1,0),(0,1),(0,-1)])
-        self.sprites = SpriteLoader()
         self.ghost_type = ghost_type or self._type_from_color(color)
         self.blinky_ref = blinky_ref
-        sprite_map = {
-            'blinky': 'ghost_red.png',
-            'pinky': 'ghost_pink.png',
-            'inky': 'ghost_blue.png',
-            'clyde': 'ghost_orange.png',
-        }
-        self.sprite = self.sprites.load(sprite_map.get(self.ghost_type, 'ghost_red.png'), (self.map.cell_size, self.map.cell_size))
         self.speed = speed
         self.frame = 0
         self.anim_frame = 0
@@ -45,6 +35,8 @@ class Ghost:
         self.scatter_target = SCATTER_TARGETS[self.ghost_type](self.map.grid)
         self.eaten = False
         self.home = self.map.ghost_start()
+        # Next step worked out by plan() when the scheduler deferred this ghost's decision
+        self.planned = None
 
     def _type_from_color(self, color):
         if color == (255,0,0): return 'blinky'
@@ -54,26 +46,29 @@ class Ghost:
         return 'blinky'
 
     def update(self, player):
+        if self.tick():
+            self.decide(player)
+
+    def tick(self):
+        # True on the frames this ghost moves; GhostScheduler decides whether it also gets to think
         self.frame = (self.frame + 1) % self.speed
-        if self.frame != 0:
-            return
+        return self.frame == 0
+
+    def decide(self, player, coast=False):
+        # coast: no path search this move, keep heading the way it was going
         # Eyes mode: go home
         if self.eaten:
-            self.move_towards(self.home)
+            if coast:
+                self.coast()
+            else:
+                self.move_towards(self.home)
             if (self.x, self.y) == self.home:
                 self.eaten = False
                 self.mode = 'scatter'
                 self.mode_timer = 420
             # No other logic while eyes
-            dx = self.x - self.fx
-            dy = self.y - self.fy
-            dist = math.hypot(dx, dy)
-            if dist > 0.01:
-                self.fx += dx/dist * min(self.move_speed, dist)
-                self.fy += dy/dist * min(self.move_speed, dist)
-            else:
-                self.fx, self.fy = float(self.x), float(self.y)
-            self.anim_frame += 1
+            self.planned = None
+            self.glide()
             return
         # Mode switching
         if self.mode == 'frightened':
@@ -95,39 +90,79 @@ class Ghost:
             self.mode = 'frightened'
             self.frightened_timer = 240
         # AI
-        if self.mode == 'frightened':
+        if coast:
+            self.coast()
+        elif self.mode == 'frightened':
             # Random move, blue/white
             dirs = [(1,0),(-1,0),(0,1),(0,-1)]
             random.shuffle(dirs)
             for d in dirs:
                 nx, ny = self.x + d[0], self.y + d[1]
                 if self.map.is_walkable(nx, ny):
-                    self.x, self.y = nx, ny
+                    self.move_to(nx, ny)
                     break
-        elif self.mode == 'scatter':
-            self.move_towards(self.scatter_target)
-        elif self.mode == 'chase':
-            if self.ghost_type == 'blinky':
-                target = (player.x, player.y)
-            elif self.ghost_type == 'pinky':
-                tx = player.x + player.dir[0]*4
-                ty = player.y + player.dir[1]*4
-                target = (max(0,min(tx,len(self.map.grid[0])-1)), max(0,min(ty,len(self.map.grid)-1)))
-            elif self.ghost_type == 'inky' and self.blinky_ref:
-                px, py = player.x + player.dir[0]*2, player.y + player.dir[1]*2
-                bx, by = self.blinky_ref.x, self.blinky_ref.y
-                vx, vy = px-bx, py-by
-                tx, ty = bx + 2*vx, by + 2*vy
-                target = (max(0,min(tx,len(self.map.grid[0])-1)), max(0,min(ty,len(self.map.grid)-1)))
-            elif self.ghost_type == 'clyde':
-                dist = (self.x-player.x)**2 + (self.y-player.y)**2
-                if dist > 64:
-                    target = (player.x, player.y)
-                else:
-                    target = self.scatter_target
-            else:
-                target = (player.x, player.y)
-            self.move_towards(target)
+        else:
+            self.move_towards(self.target(player))
+        self.planned = None
+        self.glide()
+
+    def target(self, player):
+        if self.eaten:
+            return self.home
+        if self.mode == 'scatter':
+            return self.scatter_target
+        if self.mode != 'chase':
+            return None
+        if self.ghost_type == 'blinky':
+            return (player.x, player.y)
+        if self.ghost_type == 'pinky':
+            tx = player.x + player.dir[0]*4
+            ty = player.y + player.dir[1]*4
+            return (max(0,min(tx,len(self.map.grid[0])-1)), max(0,min(ty,len(self.map.grid)-1)))
+        if self.ghost_type == 'inky' and self.blinky_ref:
+            px, py = player.x + player.dir[0]*2, player.y + player.dir[1]*2
+            bx, by = self.blinky_ref.x, self.blinky_ref.y
+            vx, vy = px-bx, py-by
+            tx, ty = bx + 2*vx, by + 2*vy
+            return (max(0,min(tx,len(self.map.grid[0])-1)), max(0,min(ty,len(self.map.grid)-1)))
+        if self.ghost_type == 'clyde':
+            dist = (self.x-player.x)**2 + (self.y-player.y)**2
+            return (player.x, player.y) if dist > 64 else self.scatter_target
+        return (player.x, player.y)
+
+    def needs_search(self):
+        # Whether the next decide() runs a graph search; corridor steps and frightened moves don't
+        if self.planned in self.map.neighbors(self.x, self.y):
+            return False
+        if self.mode == 'frightened' and not self.eaten:
+            return False
+        return self.map.level.junctions.is_node((self.x, self.y)) or self.corridor_ahead() is None
+
+    def plan(self, player):
+        # A decision deferred by the scheduler: work out the next step now, take it on the next move.
+        # Returns whether that took a search.
+        searched = self.needs_search()
+        target = self.target(player)
+        self.planned = self.step_towards(target) if target else None
+        return searched
+
+    def coast(self):
+        # Move without a search: straight on if possible, else any exit but back, else back
+        exits = self.map.neighbors(self.x, self.y)
+        ahead = (self.x + self.dir[0], self.y + self.dir[1])
+        back = (self.x - self.dir[0], self.y - self.dir[1])
+        if self.dir != (0, 0) and ahead in exits:
+            step = ahead
+        else:
+            others = [n for n in exits if n != back]
+            step = random.choice(others) if others else (exits[0] if exits else None)
+        if step:
+            self.move_to(*step)
+        else:
+            # Off the maze, e.g. the (5,5) fallback start on a level without G
+            self.wander()
+
+    def glide(self):
         # Smooth movement toward (self.x, self.y)
         dx = self.x - self.fx
         dy = self.y - self.fy
@@ -139,45 +174,66 @@ class Ghost:
             self.fx, self.fy = float(self.x), float(self.y)
         self.anim_frame += 1
 
+    def move_to(self, nx, ny):
+        self.dir = (nx - self.x, ny - self.y)
+        self.x, self.y = nx, ny
+
+    def corridor_ahead(self):
+        # In a corridor there is only one way forward, so no search is needed
+        back = (self.x - self.dir[0], self.y - self.dir[1])
+        exits = self.map.neighbors(self.x, self.y)
+        if len(exits) != 2:
+            return None
+        a, b = exits
+        if back == a:
+            return b
+        if back == b:
+            return a
+        return None
+
+    def step_towards(self, target):
+        graph = self.map.level.junctions
+        step = None
+        if not graph.is_node((self.x, self.y)):
+            step = self.corridor_ahead()
+        if step is None:
+            step = graph.next_step((self.x, self.y), target)
+        return step
+
     def move_towards(self, target):
-        queue = deque()
-        visited = set()
-        queue.append(((self.x, self.y), []))
-        while queue:
-            (cx, cy), path = queue.popleft()
-            if (cx, cy) == target and path:
-                move = path[0]
-                self.x, self.y = move
-                return
-            for d in [(1,0),(-1,0),(0,1),(0,-1)]:
-                nx, ny = cx + d[0], cy + d[1]
-                if self.map.is_walkable(nx, ny) and (nx, ny) not in visited:
-                    visited.add((nx, ny))
-                    queue.append(((nx, ny), path+[(nx, ny)]))
+        step = self.planned
+        if step not in self.map.neighbors(self.x, self.y):
+            step = self.step_towards(target)
+        if step:
+            self.move_to(*step)
+            return
+        self.wander()
+
+    def wander(self):
         # fallback: random
         dirs = [(1,0),(-1,0),(0,1),(0,-1)]
         random.shuffle(dirs)
         for d in dirs:
             nx, ny = self.x + d[0], self.y + d[1]
             if self.map.is_walkable(nx, ny):
-                self.x, self.y = nx, ny
+                self.move_to(nx, ny)
                 return
 
-    def draw(self, screen, offset=(0,0), player=None):
+    def draw(self, screen, offset=(0,0), player=None, animate=True):
         ox, oy = offset
         cell = self.map.cell_size
         px = ox + int(self.fx*cell)
         py = oy + int(self.fy*cell)
-        wobble = int(4*math.sin(self.anim_frame/6))
+        wobble = animcache.WOBBLE[self.anim_frame % animcache.WOBBLE_PERIOD] if animate else 0
+        sprite = animcache.ghost_sprite(cell, self.ghost_type)
+        if sprite and not self.eaten and self.mode != 'frightened':
+            screen.blit(sprite, (px, py + wobble))
+            return
+        frames = animcache.ghost_frames(cell)
         if self.eaten:
-            # Draw eyes: white with blue pupils
-            pygame.draw.circle(screen, (255,255,255), (px+cell//2, py+cell//2 + wobble), cell//2-2)
-            pygame.draw.circle(screen, (0,128,255), (px+cell//2-6, py+cell//2 + wobble), 4)
-            pygame.draw.circle(screen, (0,128,255), (px+cell//2+6, py+cell//2 + wobble), 4)
+            frame = frames.eyes[wobble + animcache.MAX_WOBBLE]
         elif self.mode == 'frightened':
-            color = (0,128,255) if (self.anim_frame//6)%2==0 else (255,255,255)
-            pygame.draw.circle(screen, color, (px+cell//2, py+cell//2 + wobble), cell//2-2)
-        elif self.sprite:
-            screen.blit(self.sprite, (px, py + wobble))
+            frame = frames.frightened[(self.anim_frame//6)%2][wobble + animcache.MAX_WOBBLE]
         else:
-            pygame.draw.circle(screen, self.color, (px+cell//2, py+cell//2 + wobble), cell//2-2) 
\ No newline at end of file
+            frame = frames.body(self.color)[wobble + animcache.MAX_WOBBLE]
+        screen.blit(frame, (px, py - animcache.MAX_WOBBLE))
@@ -0,0 +1,229 @@
+import heapq
+import json
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from types import MappingProxyType
+
+import pygame
+
+DIRS = [(1,0),(-1,0),(0,1),(0,-1)]
+WALL_COLOR = (0, 255, 255)
+# Wall layers kept per level, most recent cell sizes first; a resize renders a new one
+WALL_LAYERS = 2
+
+
+class CompiledLevel:
+    # Everything derivable from a level file, built once and never mutated afterwards
+    def __init__(self, path, data):
+        self.path = path
+        self.data = data
+        self.grid = tuple(data['grid'])
+        self.rows = len(self.grid)
+        self.cols = len(self.grid[0])
+        walkable = set()
+        dots = set()
+        powerups = {}
+        player_start = ghost_start = None
+        for y, row in enumerate(self.grid):
+            for x, cell in enumerate(row):
+                if cell == '#':
+                    continue
+                walkable.add((x, y))
+                if cell == '.':
+                    dots.add((x, y))
+                elif cell in 'TSI':
+                    powerups[(x, y)] = cell
+                elif cell == 'P' and player_start is None:
+                    player_start = (x, y)
+                elif cell == 'G' and ghost_start is None:
+                    ghost_start = (x, y)
+        self.walkable = frozenset(walkable)
+        self.dots = frozenset(dots)
+        # Row-major dot order plus one bit per tile; games copy the bits, never the set
+        self.dot_order = tuple(sorted(dots, key=lambda p: (p[1], p[0])))
+        bits = bytearray((self.rows * self.cols + 7) // 8)
+        for x, y in dots:
+            i = y*self.cols + x
+            bits[i >> 3] |= 1 << (i & 7)
+        self.dot_bits = bytes(bits)
+        self.powerups = MappingProxyType(powerups)
+        self.player_start = player_start or (1, 1)
+        self.ghost_start = ghost_start or (5, 5)
+        self.neighbors = MappingProxyType({
+            (x, y): tuple((x+dx, y+dy) for dx, dy in DIRS if (x+dx, y+dy) in walkable)
+            for x, y in walkable
+        })
+        self.junctions = JunctionGraph(self.neighbors)
+        self._wall_layers = OrderedDict()
+        self._layer_lock = threading.Lock()
+
+    def wall_layer(self, cell_size, sprite=None):
+        key = (cell_size, sprite is not None)
+        with self._layer_lock:
+            layer = self._wall_layers.get(key)
+            if layer is None:
+                layer = self._wall_layers[key] = self._render_walls(cell_size, sprite)
+                while len(self._wall_layers) > WALL_LAYERS:
+                    self._wall_layers.popitem(last=False)
+            else:
+                self._wall_layers.move_to_end(key)
+        return layer
+
+    def _render_walls(self, cell_size, sprite):
+        layer = pygame.Surface((self.cols * cell_size, self.rows * cell_size))
+        layer.fill((0, 0, 0))
+        layer.set_colorkey((0, 0, 0))
+        for y, row in enumerate(self.grid):
+            for x, cell in enumerate(row):
+                if cell != '#':
+                    continue
+                if sprite:
+                    layer.blit(sprite, (x*cell_size, y*cell_size))
+                else:
+                    layer.fill(WALL_COLOR, (x*cell_size, y*cell_size, cell_size, cell_size))
+        return layer
+
+
+class JunctionGraph:
+    # Junctions and dead ends as nodes, the corridors between them as weighted edges
+    def __init__(self, neighbors):
+        nodes = {p for p, nb in neighbors.items() if len(nb) != 2}
+        # edges[node] = [(other end, corridor length, first tile), ...]
+        self.edges = {}
+        # corridor[tile] = ((end, distance, neighbour toward end, first tile from end), ...) for both ends
+        self.corridor = {}
+        self.corridor_id = {}
+        unvisited = set(neighbors) - nodes
+        while True:
+            for node in list(nodes):
+                if node not in self.edges:
+                    self.edges[node] = [self._walk(neighbors, nodes, node, step, unvisited) for step in neighbors[node]]
+            if not unvisited:
+                break
+            # A loop with no junction on it still needs one node to hang its edge on
+            nodes.add(unvisited.pop())
+        self.nodes = frozenset(nodes)
+
+    def _walk(self, neighbors, nodes, start, first, unvisited):
+        path = []
+        prev, cur = start, first
+        while cur not in nodes:
+            path.append(cur)
+            unvisited.discard(cur)
+            a, b = neighbors[cur]
+            prev, cur = cur, (b if a == prev else a)
+        n = len(path)
+        ident = min((start, first), (cur, path[-1] if path else start))
+        for i, tile in enumerate(path):
+            self.corridor[tile] = (
+                (start, i + 1, path[i-1] if i else start, first),
+                (cur, n - i, path[i+1] if i < n - 1 else cur, path[-1]),
+            )
+            self.corridor_id[tile] = ident
+        return cur, n + 1, first
+
+    def is_node(self, tile):
+        return tile in self.edges
+
+    def next_step(self, start, target):
+        # A* over the junction graph; returns the first tile to move to, or None
+        if start == target or (start not in self.edges and start not in self.corridor):
+            return None
+        if target in self.edges:
+            goals = {target: (0, None)}
+        elif target in self.corridor:
+            goals = {}
+            for end, d, _, entry in self.corridor[target]:
+                if end not in goals or d < goals[end][0]:
+                    goals[end] = (d, entry)
+        else:
+            return None
+        tx, ty = target
+        best = None
+        heap = []
+        if start in self.edges:
+            heap.append((abs(start[0]-tx) + abs(start[1]-ty), 0, start, None))
+        else:
+            here = self.corridor[start]
+            if self.corridor_id.get(target) == self.corridor_id[start]:
+                # Same corridor: walking straight along it is one candidate route
+                d_here, d_target = here[0][1], self.corridor[target][0][1]
+                best = (abs(d_here - d_target), here[0][2] if d_target < d_here else here[1][2])
+            for end, d, toward, _ in here:
+                heapq.heappush(heap, (d + abs(end[0]-tx) + abs(end[1]-ty), d, end, toward))
+        settled = set()
+        while heap:
+            f, g, node, first = heapq.heappop(heap)
+            if best and f >= best[0]:
+                break
+            if node in settled:
+                continue
+            settled.add(node)
+            if node in goals:
+                extra, entry = goals[node]
+                if best is None or g + extra < best[0]:
+                    best = (g + extra, first or entry)
+            for end, length, step in self.edges[node]:
+                if end not in settled:
+                    ng = g + length
+                    heapq.heappush(heap, (ng + abs(end[0]-tx) + abs(end[1]-ty), ng, end, first or step))
+        return best[1] if best else None
+
+
+def compile_level(path, cell_size=None):
+    with open(path) as f:
+        level = CompiledLevel(path, json.load(f))
+    if cell_size:
+        level.wall_layer(cell_size)
+    return level
+
+
+class LevelCache:
+    def __init__(self, capacity=4):
+        self.capacity = capacity
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='level-prefetch')
+
+    def prefetch(self, path, cell_size=None):
+        with self.lock:
+            if path in self.entries:
+                self.entries.move_to_end(path)
+                return
+            self.entries[path] = self.executor.submit(compile_level, path, cell_size)
+            self._evict()
+
+    def get(self, path):
+        with self.lock:
+            entry = self.entries.get(path)
+            if entry is None:
+                # Not prefetched: compile here rather than queue behind another prefetch
+                entry = self.entries[path] = Future()
+                entry.set_result(compile_level(path))
+                self._evict()
+            self.entries.move_to_end(path)
+        # Only blocks when the level was requested before its prefetch finished
+        return entry.result()
+
+    def _evict(self):
+        while len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+
+
+class Campaign:
+    def __init__(self, manifest_path='levels/manifest.json', cache_size=4):
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+        self.levels = [entry['path'] for entry in manifest['levels']]
+        self.cache = LevelCache(cache_size)
+
+    def path_for(self, level):
+        # Past the last level the campaign loops back to the start
+        return self.levels[(level - 1) % len(self.levels)]
+
+    def load(self, level):
+        return self.cache.get(self.path_for(level))
+
+    def prefetch(self, level, cell_size=None):
+        self.cache.prefetch(self.path_for(level), cell_size)
@@ -1,20 +1,59 @@
-import pygame
 import sys
-import os
-import math
-from game import Game
-from menu import MainMenu
+import time
+from config import parse_args
+from startup import StartupTrace, IdleLoader
+from gcwatch import FrameGC
 
-pygame.init()
+args = parse_args()
+trace = StartupTrace(enabled=args.trace_startup)
+trace.start_imports()
+
+with trace.phase('import pygame'):
+    import pygame
+with trace.phase('import game modules'):
+    import sprites
+    from fonts import get_font
+    from game import Game
+    from controls import InputSampler
+    from level import Campaign
+    from menu import MainMenu
+    from overlay import OverlayCompositor
+    from quality import QualityGovernor
+    from sound import SoundManager
+
+with trace.phase('pygame init'):
+    if args.full_init:
+        pygame.init()
+    else:
+        # Only what the menu needs; the mixer comes up later on an idle frame
+        pygame.display.init()
+        pygame.font.init()
 
 SCREEN_WIDTH, SCREEN_HEIGHT = 1280, 720
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.RESIZABLE)
-pygame.display.set_caption('Paxman')
+with trace.phase('set_mode'):
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.RESIZABLE)
+    pygame.display.set_caption('Paxman')
 clock = pygame.time.Clock()
 
 state = 'menu'
-menu = MainMenu(screen)
+with trace.phase('menu'):
+    quality = QualityGovernor(budget=1/60, forced=None if args.quality == 'auto' else args.quality)
+    menu = MainMenu(screen, quality)
+sounds = SoundManager(lazy=not args.full_init)
+campaign = Campaign()
 game = None
+
+idle = IdleLoader()
+idle.add('mixer', sounds.init_mixer)
+idle.add('sfx', lambda: sounds.preload(['dot.wav', 'powerup.wav', 'death.wav']))
+idle.add('music', lambda: sounds.load_music('music.ogg'))
+for name in ('pacman_yellow.png', 'ghost_red.png', 'ghost_blue.png', 'ghost_orange.png',
+             'teleport.png', 'speed.png', 'invincible.png'):
+    # One sprite per task, scaled to the starting cell so only the small copy is kept
+    idle.add(name, lambda name=name: sprites.preload([name], (args.native_cell or 32,) * 2))
+idle.add('level 1', lambda: campaign.prefetch(1, args.native_cell or 32))
+idle.add('hud fonts', lambda: [get_font(size) for size in (20, 28, 48)])
+FRAME_BUDGET = 1/60
 paused = False
 fade_alpha = 0
 fade_dir = 0  # 0: no fade, 1: fade out, -1: fade in
@@ -24,63 +63,205 @@ frame = 0
 FADE_SPEED = 20
 
 
+capture = None
+if args.capture:
+    from capture import FrameCapture
+    capture = FrameCapture(args.capture, screen.get_size(), every=args.capture_every,
+                           slots=args.capture_slots, fmt=args.capture_format)
+
+events = None
+if args.telemetry:
+    import telemetry
+    from ghost import GHOST_TYPES
+    events = telemetry.Telemetry(args.telemetry, meta={'ghosts': [name for name, _ in GHOST_TYPES]})
+
+
+gcw = FrameGC(tune=args.gc_tune, report=args.gc_report, alloc_budget_kb=args.alloc_budget)
+bench = autopilot = None
+if args.bench:
+    from bench import Autopilot, BenchRun
+    bench = BenchRun(args.bench)
+    autopilot = Autopilot()
+
+
+controls = InputSampler(measure=args.measure_latency)
+
+
+def new_game():
+    g = Game(screen, menu.selected_difficulty, menu.selected_skin, sounds=sounds,
+             native_cell=args.native_cell, smooth_upscale=args.upscale == 'smooth',
+             events=events, campaign=campaign,
+             turn_buffer=args.turn_buffer, quality=quality,
+             ai_budget=args.ai_budget / 1000)
+    g.resize(screen.get_width(), screen.get_height())
+    g.reset()
+    return g
+
+
+pipeline = None
+overlay = OverlayCompositor()
+show_quality = args.show_quality
+
+
+def draw_quality(dirty):
+    text = get_font(20).render(quality.describe(), True, (255,255,255), (0,0,0))
+    rect = screen.blit(text, (8, screen.get_height() - text.get_height() - 8))
+    if dirty is not None:
+        dirty.append(rect)
+
+
+def start_game():
+    global game, pipeline
+    if pipeline:
+        pipeline.close()
+    game = new_game()
+    if args.pipeline:
+        from pipeline import SimPipeline
+        pipeline = SimPipeline(game)
+
+
+def run_instances(count, humans):
+    # Split-screen and attract mode: N games in one window over shared levels, sprites and sound
+    global screen
+    import tracemalloc
+    from bench import Autopilot
+    from controls import KEYMAPS
+    from sound import NullSound
+    from viewports import ViewportCompositor
+    idle.flush(trace)
+    gcw.assets_loaded()
+    humans = max(0, min(humans, count, len(KEYMAPS)))
+    traced = tracemalloc.is_tracing()
+    if bench and not traced:
+        tracemalloc.start()
+
+    def make(i):
+        # Only the keyboard players are heard; an all-autopilot attract loop keeps the first one
+        return Game(screen, menu.selected_difficulty, menu.selected_skin,
+                    sounds=sounds if i < max(1, humans) else NullSound(),
+                    native_cell=args.native_cell or 16, smooth_upscale=args.upscale == 'smooth',
+                    campaign=campaign, turn_buffer=args.turn_buffer, quality=quality,
+                    ai_budget=args.ai_budget / 1000)
+
+    games, footprint = [], []
+    for i in range(count):
+        before = tracemalloc.get_traced_memory()[0] if bench else 0
+        games.append(make(i))
+        if bench:
+            footprint.append(tracemalloc.get_traced_memory()[0] - before)
+    if bench and not traced:
+        # Tracing slows every allocation; keep it only when --alloc-budget asked for it
+        tracemalloc.stop()
+    pilots = [None]*humans + [Autopilot(seed=i) for i in range(humans, count)]
+    compositor = ViewportCompositor(count)
+    compositor.attach(screen, games)
+    update_secs = 0.0
+
+    def finish():
+        if bench:
+            extra = footprint[1:]
+            print(f'[instances] {count} games: first {footprint[0]/1024:.0f} KB, '
+                  f'each extra {sum(extra)/len(extra)/1024:.0f} KB (Python heap); update '
+                  f'{update_secs/len(bench.frame_times)/count*1000:.3f} ms per game per frame', file=sys.stderr)
+        shutdown()
+
+    while True:
+        frame_start = time.perf_counter()
+        gcw.begin_frame()
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                finish()
+            if event.type == pygame.VIDEORESIZE:
+                screen = pygame.display.set_mode((event.w, event.h), pygame.RESIZABLE)
+                compositor.attach(screen, games)
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_ESCAPE:
+                    finish()
+                for i, keymap in enumerate(KEYMAPS[:humans]):
+                    if event.key in keymap and not games[i].game_over:
+                        games[i].player.request_turn(keymap[event.key])
+                    elif event.key == pygame.K_RETURN and games[i].game_over:
+                        games[i] = make(i)
+                        compositor.attach(screen, games)
+        start = time.perf_counter()
+        for game, pilot in zip(games, pilots):
+            if pilot:
+                if game.game_over:
+                    game.restart()
+                pilot.step(game)
+            if not game.game_over:
+                game.update()
+        update_secs += time.perf_counter() - start
+        compositor.draw(screen, games, humans)
+        pygame.display.flip()
+        gcw.end_frame(True)
+        quality.record(time.perf_counter() - frame_start)
+        if bench:
+            bench.record(time.perf_counter() - frame_start)
+            if bench.done():
+                finish()
+            continue
+        clock.tick(60)
+
+
+def game_frame(game_events, turn):
+    running = not paused and not game.game_over
+    still = 'pause' if paused else 'game_over' if game.game_over else None
+    if still and overlay.frozen_as(still):
+        # Nothing under the overlay moves: only the pulsing title is redrawn
+        return overlay.draw(screen, frame)
+
+    def prepare(g):
+        for event in game_events:
+            g.handle_event(event)
+        if autopilot:
+            if g.game_over:
+                g.restart()
+            autopilot.step(g)
+        elif running:
+            controls.apply(g.player, turn)
+
+    if pipeline:
+        # Draw the previous tick while the simulation thread computes this one
+        game.draw(pipeline.frame(prepare, running))
+    else:
+        prepare(game)
+        if running:
+            game.update()
+        game.draw()
+    still = 'pause' if paused else 'game_over' if game.game_over else None
+    if still:
+        overlay.freeze(screen, still)
+        return overlay.draw(screen, frame)
+    overlay.thaw()
+    return None
+
+
+def shutdown():
+    if pipeline:
+        pipeline.close()
+        print(f'[pipeline] render waited on the simulation in {pipeline.waits} frames', file=sys.stderr)
+    if capture:
+        capture.close()
+    if events:
+        events.close()
+    if bench:
+        bench.report()
+        print(f'[quality] {quality.describe()}, {quality.changes} tier changes', file=sys.stderr)
+        if game:
+            game.scheduler.report()
+    controls.report()
+    gcw.report()
+    gcw.restore()
+    pygame.quit()
+    sys.exit(1 if gcw.over_budget() else 0)
+
 def start_fade(to_state):
     global fade_alpha, fade_dir, next_state
     fade_alpha = 0
     fade_dir = 1
     next_state = to_state
-
-def draw_fade(screen, alpha):
-    fade = pygame.Surface((screen.get_width(), screen.get_height()))
-    fade.fill((0,0,0))
-    fade.set_alpha(alpha)
-    screen.blit(fade, (0,0))
-
-def get_font(size):
-    font_path = 'assets/fonts/PressStart2P.ttf'
-    if os.path.exists(font_path):
-        return pygame.font.Font(font_path, size)
-    return pygame.font.SysFont('Arial', size)
-
-def draw_pause(screen, frame):
-    w, h = screen.get_size()
-    # Fade overlay
-    overlay = pygame.Surface((w, h), pygame.SRCALPHA)
-    overlay.fill((10,10,30,180))
-    screen.blit(overlay, (0,0))
-    # Pulsing neon text
-    font = get_font(64)
-    pulse = 1.0 + 0.08*math.sin(frame/8)
-    surf = font.render('PAUSED', True, (0,255,255))
-    surf = pygame.transform.rotozoom(surf, 0, pulse)
-    x = w//2 - surf.get_width()//2
-    y = h//2 - 80
-    screen.blit(surf, (x, y))
-    # Neon border
-    border = pygame.Surface((surf.get_width()+24, surf.get_height()+16), pygame.SRCALPHA)
-    pygame.draw.rect(border, (0,255,255,120), border.get_rect(), border_radius=18, width=6)
-    screen.blit(border, (x-12, y-8))
-    # Help
-    small = get_font(28).render('Press ESC to Resume', True, (255,255,255))
-    screen.blit(small, (w//2 - small.get_width()//2, h//2 + 20))
-
-def draw_game_over(screen, frame):
-    w, h = screen.get_size()
-    overlay = pygame.Surface((w, h), pygame.SRCALPHA)
-    overlay.fill((30,0,0,180))
-    screen.blit(overlay, (0,0))
-    font = get_font(64)
-    pulse = 1.0 + 0.08*math.sin(frame/8)
-    surf = font.render('GAME OVER', True, (255,0,128))
-    surf = pygame.transform.rotozoom(surf, 0, pulse)
-    x = w//2 - surf.get_width()//2
-    y = h//2 - 80
-    screen.blit(surf, (x, y))
-    border = pygame.Surface((surf.get_width()+24, surf.get_height()+16), pygame.SRCALPHA)
-    pygame.draw.rect(border, (255,0,255,120), border.get_rect(), border_radius=18, width=6)
-    screen.blit(border, (x-12, y-8))
-    small = get_font(28).render('Press ENTER for Menu', True, (255,255,255))
-    screen.blit(small, (w//2 - small.get_width()//2, h//2 + 20))
+    overlay.thaw()
 
 def player_start(self):
     for y, row in enumerate(self.grid):
@@ -105,21 +286,44 @@ def ghost_start(self):
                 return x, y
     return 5, 5
 
+if args.instances > 1:
+    run_instances(args.instances, args.humans)
+if bench:
+    # Benchmarks skip the menu and play straight away
+    idle.flush(trace)
+    gcw.assets_loaded()
+    start_game()
+    state = 'game'
+last_level = game.level if game else None
+was_frozen = False
+
 while True:
     frame += 1
+    frame_start = time.perf_counter()
+    gcw.begin_frame()
+    game_events = []
     for event in pygame.event.get():
         if event.type == pygame.QUIT:
-            pygame.quit(); sys.exit()
+            shutdown()
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+            show_quality = not show_quality
         if event.type == pygame.VIDEORESIZE:
             screen = pygame.display.set_mode((event.w, event.h), pygame.RESIZABLE)
+            overlay.thaw()
             if state == 'game' and game:
-                game.map.set_cell_size(event.w, event.h)
+                if pipeline:
+                    held = pipeline.pause()
+                    game.resize(event.w, event.h)
+                    pipeline.resume(held)
+                else:
+                    game.resize(event.w, event.h)
         if fade_dir == 0:
             if state == 'menu':
                 menu.handle_event(event)
             elif state == 'game':
                 if not paused and not game.game_over:
-                    game.handle_event(event)
+                    game_events.append(event)
+                    controls.on_event(event)
                 if event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_ESCAPE:
                         if not paused and not game.game_over:
@@ -128,33 +332,31 @@ while True:
                             paused = False
                     if game.game_over and event.key == pygame.K_RETURN:
                         start_fade('menu')
+    turn = None
+    if not autopilot and state == 'game' and fade_dir == 0 and not paused and not game.game_over:
+        turn = controls.poll()
+    dirty = None
     if fade_dir == 0:
         if state == 'menu':
             menu.update()
             menu.draw()
-            if game:
-                game.draw()
             if menu.start_game:
                 start_fade('game')
         elif state == 'game':
-            if not paused and not game.game_over:
-                game.update()
-            game.draw()
-            if paused:
-                draw_pause(screen, frame)
-            if game.game_over:
-                draw_game_over(screen, frame)
+            dirty = game_frame(game_events, turn)
     else:
         if fade_dir == 1:
             fade_alpha += FADE_SPEED
             if fade_alpha >= 255:
                 fade_alpha = 255
                 fade_dir = -1
+                overlay.thaw()
                 if next_state == 'game':
                     paused = False
-                    game = Game(screen, menu.selected_difficulty, menu.selected_skin)
-                    game.map.set_cell_size(screen.get_width(), screen.get_height())
-                    game.reset()
+                    # Whatever the menu didn't get to is loaded now, behind the fade
+                    idle.flush(trace)
+                    gcw.assets_loaded()
+                    start_game()
                     state = 'game'
                 elif next_state == 'menu':
                     state = 'menu'
@@ -164,19 +366,49 @@ while True:
             if fade_alpha <= 0:
                 fade_alpha = 0
                 fade_dir = 0
-        if state == 'menu':
-            menu.update()
-            menu.draw()
-            if game:
-                game.draw()
-        elif state == 'game':
-            if not paused and not game.game_over:
-                game.update()
-            game.draw()
-            if paused:
-                draw_pause(screen, frame)
-            if game.game_over:
-                draw_game_over(screen, frame)
-        draw_fade(screen, fade_alpha)
-    pygame.display.flip()
-    clock.tick(60) 
\ No newline at end of file
+                overlay.thaw()
+        if not overlay.frozen_as('fade'):
+            # Render the scene once and cross-fade over the cached copy
+            if state == 'menu':
+                menu.update()
+                menu.draw()
+            elif state == 'game':
+                game_frame(game_events, turn)
+            overlay.freeze(screen, 'fade')
+        overlay.draw_fade(screen, fade_alpha)
+    if capture:
+        capture.capture(screen, frame)
+    steady = state == 'game' and fade_dir == 0 and not paused and not game.game_over
+    if show_quality:
+        draw_quality(dirty)
+    if dirty:
+        pygame.display.update(dirty)
+    else:
+        pygame.display.flip()
+    controls.presented(steady)
+    if events and state == 'game':
+        frame_us = int((time.perf_counter() - frame_start) * 1e6)
+        if frame_us > FRAME_BUDGET * 1.5e6:
+            events.emit(telemetry.FRAME_OUTLIER, frame_us, int(FRAME_BUDGET * 1e6))
+    # Full collections are deferred to moments where a hitch can't be seen
+    frozen = state != 'game' or paused or game.game_over
+    if game and (game.level != last_level or (frozen and not was_frozen)):
+        gcw.safe_point()
+    last_level = game.level if game else None
+    was_frozen = frozen
+    gcw.end_frame(steady)
+    if steady or (state == 'menu' and fade_dir == 0):
+        # Frozen overlays and fades cost almost nothing and would hide real load
+        quality.record(time.perf_counter() - frame_start)
+    if bench:
+        bench.record(time.perf_counter() - frame_start)
+        if bench.done():
+            shutdown()
+        continue
+    if not trace.reported:
+        trace.report()
+    elif idle.pending() and state == 'menu':
+        idle.run(frame_start + FRAME_BUDGET * 0.75, trace)
+        if not idle.pending():
+            trace.report('idle warm-up done')
+    controls.wait(clock, 60) 
\ No newline at end of file
@@ -1,14 +1,13 @@
 import pygame
-import json
-import os
 from sprites import SpriteLoader
+from level import compile_level
 
 class GameMap:
-    def __init__(self, level_path='levels/level1.json'):
-        with open(level_path) as f:
-            self.data = json.load(f)
-        self.grid = self.data['grid']
-        self.cell_size = 32
+    def __init__(self, level_path='levels/level1.json', cell_size=32, level=None):
+        self.level = level or compile_level(level_path)
+        self.data = self.level.data
+        self.grid = self.level.grid
+        self.cell_size = cell_size
         self._init_dots()
         self._init_powerups()
         self.sprites = SpriteLoader()
@@ -30,29 +29,33 @@ class GameMap:
         self._load_sprites()
 
     def _init_dots(self):
-        self.dots = set()
-        for y, row in enumerate(self.grid):
-            for x, cell in enumerate(row):
-                if cell == '.':
-                    self.dots.add((x, y))
+        # Per-game state is a bitset over the shared level; everything else lives in CompiledLevel
+        self.dot_bits = bytearray(self.level.dot_bits)
+        self.dot_count = len(self.level.dots)
 
     def _init_powerups(self):
-        self.powerups = {}
-        for y, row in enumerate(self.grid):
-            for x, cell in enumerate(row):
-                if cell in 'TSI':
-                    self.powerups[(x, y)] = cell
+        self.powerups = dict(self.level.powerups)
 
     def is_walkable(self, x, y):
-        if 0 <= y < len(self.grid) and 0 <= x < len(self.grid[0]):
-            return self.grid[y][x] != '#'
-        return False
+        return (x, y) in self.level.walkable
+
+    def neighbors(self, x, y):
+        return self.level.neighbors.get((x, y), ())
+
+    def has_dot(self, x, y, bits=None):
+        i = y*self.level.cols + x
+        return bool((self.dot_bits if bits is None else bits)[i >> 3] >> (i & 7) & 1)
+
+    def clear_dot(self, bits, x, y):
+        i = y*self.level.cols + x
+        bits[i >> 3] &= ~(1 << (i & 7))
 
     def eat_dot(self, x, y):
-        if (x, y) in self.dots:
-            self.dots.remove((x, y))
-            return True
-        return False
+        if not (0 <= x < self.level.cols and 0 <= y < self.level.rows) or not self.has_dot(x, y):
+            return False
+        self.clear_dot(self.dot_bits, x, y)
+        self.dot_count -= 1
+        return True
 
     def eat_powerup(self, x, y):
         if (x, y) in self.powerups:
@@ -61,42 +64,34 @@ class GameMap:
         return None
 
     def dots_left(self):
-        return len(self.dots)
+        return self.dot_count
 
     def player_start(self):
-        for y, row in enumerate(self.grid):
-            for x, cell in enumerate(row):
-                if cell == 'P':
-                    return x, y
-        return 1, 1
+        return self.level.player_start
 
     def ghost_start(self):
-        for y, row in enumerate(self.grid):
-            for x, cell in enumerate(row):
-                if cell == 'G':
-                    return x, y
-        return 5, 5
+        return self.level.ghost_start
 
-    def draw(self, screen, offset=(0,0)):
+    def draw(self, screen, offset=(0,0), dots=None, powerups=None):
         ox, oy = offset
-        for y, row in enumerate(self.grid):
-            for x, cell in enumerate(row):
-                rect = pygame.Rect(ox + x*self.cell_size, oy + y*self.cell_size, self.cell_size, self.cell_size)
-                if cell == '#':
-                    if self.wall_sprite:
-                        screen.blit(self.wall_sprite, (ox + x*self.cell_size, oy + y*self.cell_size))
-                    else:
-                        pygame.draw.rect(screen, (0, 255, 255), rect)
-                elif (x, y) in self.dots:
-                    if self.dot_sprite:
-                        screen.blit(self.dot_sprite, (ox + x*self.cell_size + self.cell_size//4, oy + y*self.cell_size + self.cell_size//4))
-                    else:
-                        pygame.draw.circle(screen, (255,255,255), rect.center, 4)
-                elif (x, y) in self.powerups:
-                    kind = self.powerups[(x, y)]
-                    sprite = self.powerup_sprites.get(kind)
-                    if sprite:
-                        screen.blit(sprite, (ox + x*self.cell_size, oy + y*self.cell_size))
-                    else:
-                        color = {'T': (0,255,255), 'S': (255,0,255), 'I': (255,255,0)}[kind]
-                        pygame.draw.circle(screen, color, rect.center, self.cell_size//3) 
\ No newline at end of file
+        cell = self.cell_size
+        bits = self.dot_bits if dots is None else dots
+        cols = self.level.cols
+        powerups = self.powerups if powerups is None else powerups
+        # Walls come from a layer rendered once per level and cell size
+        screen.blit(self.level.wall_layer(cell, self.wall_sprite), (ox, oy))
+        for x, y in self.level.dot_order:
+            i = y*cols + x
+            if not bits[i >> 3] >> (i & 7) & 1:
+                continue
+            if self.dot_sprite:
+                screen.blit(self.dot_sprite, (ox + x*cell + cell//4, oy + y*cell + cell//4))
+            else:
+                pygame.draw.circle(screen, (255,255,255), (ox + x*cell + cell//2, oy + y*cell + cell//2), 4)
+        for (x, y), kind in powerups.items():
+            sprite = self.powerup_sprites.get(kind)
+            if sprite:
+                screen.blit(sprite, (ox + x*cell, oy + y*cell))
+            else:
+                color = {'T': (0,255,255), 'S': (255,0,255), 'I': (255,255,0)}[kind]
+                pygame.draw.circle(screen, color, (ox + x*cell + cell//2, oy + y*cell + cell//2), cell//3)
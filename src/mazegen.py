@@ -0,0 +1,208 @@
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+MAX_SIZE = 1000
+WALL, OPEN = ord('#'), ord('.')
+POWERUP_KINDS = 'TSI'
+COLLECTIBLE = bytes(1 if chr(i) in '.' + POWERUP_KINDS else 0 for i in range(256))
+
+
+def _carve(cw, ch, rng, braid):
+    # Iterative recursive-backtracker over a cw x ch cell lattice; cells sit on odd tiles
+    tw = 2*cw + 1
+    tiles = bytearray(tw * (2*ch + 1))
+    visited = bytearray(cw * ch)
+
+    def tile(c):
+        return (2*(c // cw) + 1) * tw + 2*(c % cw) + 1
+
+    start = rng.randrange(cw * ch)
+    visited[start] = 1
+    tiles[tile(start)] = 1
+    stack = [start]
+    while stack:
+        c = stack[-1]
+        cx, cy = c % cw, c // cw
+        options = []
+        if cx > 0 and not visited[c-1]:
+            options.append(c-1)
+        if cx < cw-1 and not visited[c+1]:
+            options.append(c+1)
+        if cy > 0 and not visited[c-cw]:
+            options.append(c-cw)
+        if cy < ch-1 and not visited[c+cw]:
+            options.append(c+cw)
+        if not options:
+            stack.pop()
+            continue
+        n = options[rng.randrange(len(options))]
+        visited[n] = 1
+        t, u = tile(c), tile(n)
+        tiles[(t+u)//2] = tiles[u] = 1
+        stack.append(n)
+    if braid:
+        # Knock dead ends through to a neighbour so ghosts can't trap the player in them
+        for c in range(cw * ch):
+            cx, cy = c % cw, c // cw
+            t = tile(c)
+            walls = []
+            if cx > 0:
+                walls.append(t-1)
+            if cx < cw-1:
+                walls.append(t+1)
+            if cy > 0:
+                walls.append(t-tw)
+            if cy < ch-1:
+                walls.append(t+tw)
+            closed = [w for w in walls if not tiles[w]]
+            if len(walls) - len(closed) == 1 and closed and rng.random() < braid:
+                tiles[closed[rng.randrange(len(closed))]] = 1
+    return tiles, tw
+
+
+def _nearest_open(rows, x, y):
+    best = None
+    for ry, row in enumerate(rows):
+        for rx, cell in enumerate(row):
+            if cell == OPEN:
+                d = abs(rx - x) + abs(ry - y)
+                if best is None or d < best[0]:
+                    best = (d, rx, ry)
+    return best[1], best[2]
+
+
+def generate(width, height, seed=None, braid=0.75, symmetric=False, powerups=None):
+    if not (5 <= width <= MAX_SIZE and 5 <= height <= MAX_SIZE):
+        raise ValueError(f'maze size must be between 5 and {MAX_SIZE} on each side')
+    if symmetric and width % 2 == 0:
+        raise ValueError('symmetric mazes need an odd width')
+    rng = random.Random(seed)
+    half = width//2 + 1 if symmetric else width
+    tiles, tw = _carve((half - 1 + symmetric) // 2, (height - 1) // 2, rng, braid)
+    th = len(tiles) // tw
+    rows = []
+    for y in range(height):
+        row = bytearray(b'#' * width)
+        if y < th:
+            for x in range(min(half, tw)):
+                if tiles[y*tw + x]:
+                    row[x] = OPEN
+        if symmetric:
+            row[half:] = row[:width - half][::-1]
+        rows.append(row)
+    mid = width // 2
+    if symmetric and mid % 2 == 0:
+        # The mirror line fell on a wall column: open doors so the two halves meet
+        doors = [y for y in range(1, th - 1, 2)]
+        for y in rng.sample(doors, max(1, len(doors) // 4)):
+            rows[y][mid] = OPEN
+    px, py = _nearest_open(rows, mid, height * 3 // 4)
+    rows[py][px] = ord('P')
+    gx, gy = _nearest_open(rows, mid, height // 2)
+    rows[gy][gx] = ord('G')
+    spots = [(x, y) for y, row in enumerate(rows) for x, cell in enumerate(row)
+             if cell == OPEN and (not symmetric or (x < mid and row[width-1-x] == OPEN))]
+    if powerups is None:
+        powerups = max(3, len(spots) // 300)
+    if symmetric:
+        powerups = (powerups + 1) // 2
+    for i, (x, y) in enumerate(rng.sample(spots, min(powerups, len(spots)))):
+        kind = ord(POWERUP_KINDS[i % len(POWERUP_KINDS)])
+        rows[y][x] = kind
+        if symmetric:
+            rows[y][width-1-x] = kind
+    return [row.decode() for row in rows]
+
+
+def validate(grid):
+    # One flood fill from P: every dot and power-up must be reached, and so must G
+    if not grid or any(len(row) != len(grid[0]) for row in grid):
+        return ['grid is empty or not rectangular']
+    w = len(grid[0])
+    flat = ''.join(grid).encode()
+    size = len(flat)
+    start = flat.find(b'P')
+    if start < 0:
+        return ['no player start (P)']
+    problems = []
+    if flat.count(b'P') > 1:
+        problems.append('more than one P')
+    ghost = flat.find(b'G')
+    if ghost < 0:
+        problems.append('no ghost start (G)')
+    seen = bytearray(size)
+    seen[start] = 1
+    queue = [start]
+    for i in queue:
+        x = i % w
+        for n in (i-1 if x > 0 else -1, i+1 if x < w-1 else -1, i-w, i+w):
+            if 0 <= n < size and not seen[n] and flat[n] != WALL:
+                seen[n] = 1
+                queue.append(n)
+    if ghost >= 0 and not seen[ghost]:
+        problems.append('G is walled off from the maze')
+    # Both masks hold one 0/1 byte per tile, so the count is a single big-int AND
+    wanted = int.from_bytes(flat.translate(COLLECTIBLE), 'little')
+    stranded = (wanted & ~int.from_bytes(seen, 'little')).bit_count()
+    if stranded:
+        problems.append(f'{stranded} dots or power-ups cannot be reached from P')
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='mazegen', description='Generate validated Paxman levels')
+    parser.add_argument('size', metavar='WxH', help=f'maze size, up to {MAX_SIZE}x{MAX_SIZE}')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--count', type=int, default=1, help='levels to generate, with consecutive seeds')
+    parser.add_argument('--braid', type=float, default=0.75, help='chance each dead end is opened into a loop')
+    parser.add_argument('--symmetric', action='store_true', help='mirror the maze left to right (odd widths)')
+    parser.add_argument('--powerups', type=int, help='power-ups to place (default scales with size)')
+    parser.add_argument('--out', default='levels', metavar='DIR')
+    parser.add_argument('--manifest', metavar='PATH',
+                        help='append the generated levels to this campaign manifest (e.g. levels/manifest.json)')
+    args = parser.parse_args(argv)
+    try:
+        width, height = (int(v) for v in args.size.lower().split('x'))
+    except ValueError:
+        parser.error(f'bad size {args.size!r}, expected e.g. 63x41')
+    os.makedirs(args.out, exist_ok=True)
+    written = []
+    gen_secs = check_secs = 0.0
+    for seed in range(args.seed, args.seed + args.count):
+        start = time.perf_counter()
+        try:
+            grid = generate(width, height, seed, args.braid, args.symmetric, args.powerups)
+        except ValueError as e:
+            parser.error(str(e))
+        mid = time.perf_counter()
+        problems = validate(grid)
+        end = time.perf_counter()
+        gen_secs += mid - start
+        check_secs += end - mid
+        if problems:
+            print(f'seed {seed}: ' + '; '.join(problems), file=sys.stderr)
+            sys.exit(1)
+        path = os.path.join(args.out, f'maze_{width}x{height}_s{seed}.json')
+        with open(path, 'w') as f:
+            json.dump({'grid': grid}, f, indent=2)
+        written.append(path)
+    tiles = width * height * args.count
+    print(f'{args.count} x {width}x{height}: generated in {gen_secs*1000:.1f} ms '
+          f'({tiles/gen_secs/1e6:.2f} M tiles/s), validated in {check_secs*1000:.1f} ms '
+          f'({tiles/check_secs/1e6:.2f} M tiles/s)')
+    if args.manifest:
+        with open(args.manifest) as f:
+            manifest = json.load(f)
+        manifest['levels'].extend({'path': path.replace(os.sep, '/')} for path in written)
+        with open(args.manifest, 'w') as f:
+            json.dump(manifest, f, indent=2)
+    for path in written:
+        print(path)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,18 +1,15 @@
 import pygame
-import os
 import math
+from fonts import get_font
+from quality import QualityGovernor
 
 class MainMenu:
-    def __init__(self, screen):
+    def __init__(self, screen, quality=None):
         self.screen = screen
+        self.quality = quality or QualityGovernor(forced='high')
         self.start_game = False
-        font_path = 'assets/fonts/PressStart2P.ttf'
-        if os.path.exists(font_path):
-            self.font = pygame.font.Font(font_path, 64)
-            self.small_font = pygame.font.Font(font_path, 32)
-        else:
-            self.font = pygame.font.SysFont('Arial', 64)
-            self.small_font = pygame.font.SysFont('Arial', 32)
+        self.font = get_font(64)
+        self.small_font = get_font(32)
         self.difficulties = ['Easy', 'Normal', 'Hard']
         self.skins = ['Yellow', 'Green', 'Pink']
         self.diff_idx = 1
@@ -65,11 +62,13 @@ class MainMenu:
         self.screen.blit(prompt, (w//2 - prompt.get_width()//2, prompt_y))
         # Difficulty
         diff_y = int(260 + (320-260)*(1-o_slide))
+        pulsing = self.quality.tier.pulse
         for i, d in enumerate(self.difficulties):
             color = (255,255,0) if i == self.diff_idx else (120,120,60)
             pulse = 1.0 + 0.08*math.sin(self.frame/8) if i == self.diff_idx else 1.0
             surf = self.small_font.render(f'Difficulty: {d}' if i == self.diff_idx else d, True, color)
-            surf = pygame.transform.rotozoom(surf, 0, pulse)
+            if pulsing:
+                surf = pygame.transform.rotozoom(surf, 0, pulse)
             x = w//2 - surf.get_width()//2
             y = diff_y + i*44
             self.screen.blit(surf, (x, y))
@@ -84,7 +83,8 @@ class MainMenu:
             color = (255,128,255) if i == self.skin_idx else (120,60,120)
             pulse = 1.0 + 0.08*math.sin(self.frame/8+2) if i == self.skin_idx else 1.0
             surf = self.small_font.render(f'Skin: {s}' if i == self.skin_idx else s, True, color)
-            surf = pygame.transform.rotozoom(surf, 0, pulse)
+            if pulsing:
+                surf = pygame.transform.rotozoom(surf, 0, pulse)
             x = w//2 - surf.get_width()//2
             y = skin_y + i*44
             self.screen.blit(surf, (x, y))
@@ -0,0 +1,92 @@
+import math
+import pygame
+from fonts import get_font
+
+OVERLAYS = {
+    # kind: (tint, title, title color, border color, help line)
+    'pause': ((10,10,30,180), 'PAUSED', (0,255,255), (0,255,255,120), 'Press ESC to Resume'),
+    'game_over': ((30,0,0,180), 'GAME OVER', (255,0,128), (255,0,255,120), 'Press ENTER for Menu'),
+}
+# Pulse scales are rounded to this step so each title only has a few dozen cached frames
+PULSE_STEP = 0.005
+
+
+class OverlayCompositor:
+    def __init__(self):
+        self.size = None
+        self.kind = None
+        self.frozen = None
+        self.base = None
+        self.tint = None
+        self.fade = None
+        self.titles = {}
+        self.title_area = None
+        self.needs_full = False
+
+    def _allocate(self, size):
+        if size == self.size:
+            return
+        self.size = size
+        self.frozen = pygame.Surface(size)
+        self.base = pygame.Surface(size)
+        self.tint = pygame.Surface(size, pygame.SRCALPHA)
+        self.fade = pygame.Surface(size)
+        self.fade.fill((0,0,0))
+
+    def frozen_as(self, kind):
+        return self.kind == kind
+
+    def thaw(self):
+        self.kind = None
+
+    def freeze(self, screen, kind):
+        # Called once when the game stops moving; later frames reuse this image
+        self._allocate(screen.get_size())
+        self.frozen.blit(screen, (0,0))
+        self.kind = kind
+        self.needs_full = True
+        if kind not in OVERLAYS:
+            return
+        w, h = self.size
+        tint, _, _, _, help_text = OVERLAYS[kind]
+        self.base.blit(self.frozen, (0,0))
+        self.tint.fill(tint)
+        self.base.blit(self.tint, (0,0))
+        small = get_font(28).render(help_text, True, (255,255,255))
+        self.base.blit(small, (w//2 - small.get_width()//2, h//2 + 20))
+        biggest = self._title(kind, 1.08)
+        bw, bh = biggest.get_size()
+        self.title_area = pygame.Rect(w//2 - (bw-24)//2 - 12, h//2 - 88, bw, bh)
+
+    def _title(self, kind, pulse):
+        key = (kind, round(pulse / PULSE_STEP))
+        surf = self.titles.get(key)
+        if surf is None:
+            _, title, color, border_color, _ = OVERLAYS[kind]
+            text = pygame.transform.rotozoom(get_font(64).render(title, True, color), 0, pulse)
+            surf = pygame.Surface((text.get_width()+24, text.get_height()+16), pygame.SRCALPHA)
+            surf.blit(text, (12, 8))
+            pygame.draw.rect(surf, border_color, surf.get_rect(), border_radius=18, width=6)
+            self.titles[key] = surf
+        return surf
+
+    def draw(self, screen, frame):
+        # Returns the rects that changed, so the caller can update just those
+        w, h = self.size
+        surf = self._title(self.kind, 1.0 + 0.08*math.sin(frame/8))
+        x = w//2 - (surf.get_width()-24)//2 - 12
+        y = h//2 - 80 - 8
+        if self.needs_full:
+            self.needs_full = False
+            screen.blit(self.base, (0,0))
+            screen.blit(surf, (x, y))
+            return None
+        area = self.title_area.union(pygame.Rect(x, y, surf.get_width(), surf.get_height()))
+        screen.blit(self.base, area, area)
+        screen.blit(surf, (x, y))
+        return [area]
+
+    def draw_fade(self, screen, alpha):
+        screen.blit(self.frozen, (0,0))
+        self.fade.set_alpha(alpha)
+        screen.blit(self.fade, (0,0))
@@ -0,0 +1,69 @@
+import queue
+import threading
+
+
+class SimPipeline:
+    # Runs Game.update for tick N+1 on a worker thread while the main thread draws tick N
+    def __init__(self, game):
+        self.game = game
+        self.lock = threading.Lock()
+        self.requests = queue.Queue(maxsize=1)
+        self.snapshots = queue.Queue(maxsize=1)
+        self.dots = bytearray()
+        self.powerups = {}
+        self.sim_time = 0.0
+        self.waits = 0
+        game.record_changes = True
+        game.map_fresh = True
+        with self.lock:
+            self.snapshots.put(game.snapshot())
+        self.thread = threading.Thread(target=self._run, name='sim', daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        while True:
+            job = self.requests.get()
+            if job is None:
+                break
+            prepare, step = job
+            with self.lock:
+                if prepare:
+                    prepare(self.game)
+                if step:
+                    self.game.update()
+                snap = self.game.snapshot()
+            self.snapshots.put(snap)
+
+    def frame(self, prepare=None, step=True):
+        # Hand-off is bounded to one tick in flight, so the simulation never runs further ahead
+        if self.snapshots.empty():
+            self.waits += 1
+        snap = self.snapshots.get()
+        self.requests.put((prepare, step))
+        return self._mirror(snap)
+
+    def _mirror(self, snap):
+        if snap.dots is not None:
+            self.dots = snap.dots
+            self.powerups = snap.powerups
+        for x, y in snap.dots_eaten:
+            snap.map.clear_dot(self.dots, x, y)
+        for pos in snap.powerups_eaten:
+            self.powerups.pop(pos, None)
+        snap.dots = self.dots
+        snap.powerups = self.powerups
+        return snap
+
+    def pause(self):
+        # Waits for the in-flight tick and holds the game still, e.g. to resize or reset it
+        snap = self.snapshots.get()
+        self.lock.acquire()
+        return snap
+
+    def resume(self, snap):
+        self.lock.release()
+        self.snapshots.put(snap)
+
+    def close(self):
+        self.requests.put(None)
+        self.thread.join()
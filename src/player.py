@@ -1,22 +1,18 @@
 import pygame
 import math
-from sprites import SpriteLoader
+import animcache
 
 class Player:
-    def __init__(self, game_map, skin='Yellow'):
+    def __init__(self, game_map, skin='Yellow', turn_buffer=0):
         self.map = game_map
+        self.skin = skin
+        # Frames a requested turn stays queued (0 keeps it until it can be taken)
+        self.turn_buffer = turn_buffer
+        self.turn_timer = 0
         self.x, self.y = self.map.player_start()
         self.fx, self.fy = float(self.x), float(self.y)
         self.dir = (0, 0)
         self.next_dir = (0, 0)
-        self.sprites = SpriteLoader()
-        skin_map = {
-            'Yellow': 'pacman_yellow.png',
-            'Green': 'pacman_green.png',
-            'Pink': 'pacman_pink.png',
-        }
-        sprite_name = skin_map.get(skin, 'pacman_yellow.png')
-        self.sprite = self.sprites.load(sprite_name, (self.map.cell_size, self.map.cell_size))
         self.teleport_uses = 0
         self.speed_timer = 0
         self.invincible_timer = 0
@@ -26,27 +22,37 @@ class Player:
     def handle_event(self, event):
         if event.type == pygame.KEYDOWN:
             if event.key == pygame.K_UP:
-                self.next_dir = (0, -1)
+                self.request_turn((0, -1))
             elif event.key == pygame.K_DOWN:
-                self.next_dir = (0, 1)
+                self.request_turn((0, 1))
             elif event.key == pygame.K_LEFT:
-                self.next_dir = (-1, 0)
+                self.request_turn((-1, 0))
             elif event.key == pygame.K_RIGHT:
-                self.next_dir = (1, 0)
+                self.request_turn((1, 0))
             elif event.key == pygame.K_SPACE and self.teleport_uses > 0:
                 # Teleport to opposite side
                 self.x = len(self.map.grid[0]) - 1 - self.x
                 self.fx = float(self.x)
                 self.teleport_uses -= 1
 
+    def request_turn(self, direction):
+        self.next_dir = direction
+        self.turn_timer = self.turn_buffer
+
     def update(self):
         if self.speed_timer > 0:
             self.speed_timer -= 1
         if self.invincible_timer > 0:
             self.invincible_timer -= 1
+        if self.turn_timer > 0:
+            self.turn_timer -= 1
+            if self.turn_timer == 0:
+                # Buffer window ran out without a chance to turn
+                self.next_dir = self.dir
         moves = 2 if self.is_speed_boosted() else 1
         for _ in range(moves):
-            # Try to turn if possible
+            # Try to turn if possible; x/y stay on a tile until the glide out of it arrives,
+            # so a turn pressed just after passing a junction is still taken there
             nx, ny = self.x + self.next_dir[0], self.y + self.next_dir[1]
             if self.map.is_walkable(nx, ny):
                 self.dir = self.next_dir
@@ -68,31 +74,15 @@ class Player:
     def draw(self, screen, offset=(0,0)):
         ox, oy = offset
         cell = self.map.cell_size
-        px = ox + int(self.fx*cell)
-        py = oy + int(self.fy*cell)
-        if self.sprite:
-            screen.blit(self.sprite, (px, py))
-        else:
-            # Animated mouth
-            angle = 30 + 20*math.sin(self.anim_frame/3)
-            direction = self.dir
-            if direction == (0, -1):  # up
-                rot = 90
-            elif direction == (0, 1):  # down
-                rot = 270
-            elif direction == (-1, 0):  # left
-                rot = 180
-            else:  # right or idle
-                rot = 0
-            pygame.draw.arc(screen, (255,255,0), (px, py, cell, cell),
-                math.radians(angle+rot), math.radians(360-angle+rot), cell//2)
-            pygame.draw.circle(screen, (255,255,0), (px+cell//2, py+cell//2), cell//2-2)
+        frames = animcache.player_frames(cell, self.skin)[self.dir]
+        screen.blit(frames[self.anim_frame % len(frames)], (ox + int(self.fx*cell), oy + int(self.fy*cell)))
 
     def respawn(self):
         self.x, self.y = self.map.player_start()
         self.fx, self.fy = float(self.x), float(self.y)
         self.dir = (0, 0)
         self.next_dir = (0, 0)
+        self.turn_timer = 0
 
     def apply_powerup(self, kind):
         if kind == 'T':
@@ -0,0 +1,68 @@
+from collections import deque, namedtuple
+from gcwatch import percentile
+
+Tier = namedtuple('Tier', 'name particles popups alpha smooth shake wobble pulse')
+
+# Best first; each step gives up the effects that cost most per frame for the least visual loss
+TIERS = [
+    Tier('high', 12, True, True, True, True, True, True),
+    Tier('medium', 6, True, True, False, True, True, True),
+    Tier('low', 3, True, False, False, True, False, False),
+    Tier('minimal', 0, False, False, False, False, False, False),
+]
+TIER_NAMES = [tier.name for tier in TIERS]
+
+
+class QualityGovernor:
+    def __init__(self, budget=1/60, window=60, forced=None, down_at=0.9, up_at=0.55, up_hold=4):
+        # Step down when the window's p90 exceeds down_at of the budget; step up only after
+        # up_hold full windows with p90 under up_at. The gap between the two stops oscillation;
+        # a step up that is undone by the next change doubles up_hold, up to max_hold windows.
+        self.budget = budget
+        self.window = window
+        self.down_at = down_at
+        self.up_at = up_at
+        self.up_hold = up_hold
+        self.max_hold = up_hold * 16
+        self.last_step = 0
+        self.forced = forced
+        self.level = TIER_NAMES.index(forced) if forced else 0
+        self.tier = TIERS[self.level]
+        self.samples = deque(maxlen=window)
+        self.calm = 0
+        self.changes = 0
+        self.last_p90 = 0.0
+
+    def record(self, frame_secs):
+        if self.forced:
+            return
+        self.samples.append(frame_secs)
+        if len(self.samples) < self.window:
+            return
+        self.last_p90 = percentile(self.samples, 0.9)
+        if self.last_p90 > self.budget * self.down_at and self.level < len(TIERS) - 1:
+            self._set(self.level + 1)
+        elif self.last_p90 < self.budget * self.up_at and self.level > 0:
+            self.calm += 1
+            if self.calm >= self.up_hold:
+                self._set(self.level - 1)
+            else:
+                self.samples.clear()
+        else:
+            self.calm = 0
+            self.samples.clear()
+
+    def _set(self, level):
+        if level > self.level and self.last_step < 0:
+            self.up_hold = min(self.up_hold * 2, self.max_hold)
+        self.last_step = level - self.level
+        self.level = level
+        self.tier = TIERS[level]
+        self.changes += 1
+        self.calm = 0
+        # The new tier is judged only on frames drawn with it
+        self.samples.clear()
+
+    def describe(self):
+        mode = 'forced' if self.forced else 'auto'
+        return f'quality {self.tier.name} ({mode}) p90 {self.last_p90*1000:.1f} ms'
@@ -0,0 +1,53 @@
+import pygame
+
+# Room kept above and below the playfield for the score bar and lives row
+HUD_TOP = 112
+HUD_BOTTOM = 80
+
+
+class RenderTarget:
+    def __init__(self, cols, rows, cell=16, smooth=False):
+        self.cell = cell
+        self.smooth = smooth
+        self.surface = pygame.Surface((cols*cell, rows*cell))
+        if pygame.display.get_surface():
+            self.surface = self.surface.convert()
+        self.rect = pygame.Rect(0, 0, cols*cell, rows*cell)
+        self.scale = 1.0
+        self._screen_size = None
+        self._dest = None
+        self._dest_owner = None
+
+    def layout(self, screen):
+        size = screen.get_size()
+        if size == self._screen_size and self._dest_owner is screen:
+            return self.rect
+        w, h = size
+        cw, ch = self.surface.get_size()
+        scale = min(w / cw, max(1, h - HUD_TOP - HUD_BOTTOM) / ch)
+        if not self.smooth and scale >= 1:
+            scale = int(scale)
+        dw, dh = max(1, int(cw*scale)), max(1, int(ch*scale))
+        top = HUD_TOP + (h - HUD_TOP - HUD_BOTTOM - dh) // 2
+        self.rect = pygame.Rect((w - dw)//2, max(0, top), dw, dh).clip(screen.get_rect())
+        self.scale = scale
+        self._screen_size = size
+        self._dest_owner = screen
+        # Scale straight into the window when the formats allow it, saving a full-size blit
+        self._dest = screen.subsurface(self.rect) if self.rect.size == (dw, dh) else None
+        self._scaled = None if self._dest else pygame.Surface((dw, dh))
+        return self.rect
+
+    def present(self, screen):
+        self.layout(screen)
+        dest = self._dest or self._scaled
+        scale = pygame.transform.smoothscale if self.smooth else pygame.transform.scale
+        try:
+            scale(self.surface, dest.get_size(), dest)
+        except ValueError:
+            # smoothscale needs matching 24/32-bit formats; fall back to a private buffer
+            self._dest = None
+            self._scaled = dest = pygame.Surface(dest.get_size())
+            scale(self.surface, dest.get_size(), dest)
+        if dest is not self._dest:
+            screen.blit(dest, self.rect)
@@ -0,0 +1,75 @@
+import sys
+import time
+from collections import deque
+
+from gcwatch import percentile
+
+
+class GhostScheduler:
+    # Spreads ghost decisions over frames and caps the time spent on them in any one frame
+    def __init__(self, budget=0.001, window=600):
+        self.budget = budget
+        # Ghosts that moved without deciding; they plan their next step as soon as time allows
+        self.pending = deque()
+        self.queued = set()
+        self.decisions = deque(maxlen=window)
+        self.deferred = deque(maxlen=window)
+        self.ai_times = deque(maxlen=window)
+        self.total_decisions = 0
+        self.total_deferred = 0
+
+    def stagger(self, ghosts):
+        # Same cadence as before, but equal-speed ghosts no longer all think on the same frame
+        self.pending.clear()
+        self.queued.clear()
+        for i, ghost in enumerate(ghosts):
+            ghost.frame = i * ghost.speed // len(ghosts)
+
+    def update(self, ghosts, player):
+        start = time.perf_counter()
+        decided = deferred = 0
+        # Only junction searches count against the budget; corridor steps are a table lookup
+        # Carried-over work first, so a ghost is never more than one move behind
+        while self.pending and (not decided or time.perf_counter() - start < self.budget):
+            ghost = self.pending.popleft()
+            if ghost in self.queued:
+                self.queued.discard(ghost)
+                decided += ghost.plan(player)
+        for ghost in ghosts:
+            if not ghost.tick():
+                continue
+            if not ghost.needs_search():
+                # Nothing to think about; a stale carry-over entry is dropped
+                self.queued.discard(ghost)
+                ghost.decide(player)
+            elif ghost not in self.queued and (not decided or time.perf_counter() - start < self.budget):
+                ghost.decide(player)
+                decided += 1
+            else:
+                ghost.decide(player, coast=True)
+                if ghost not in self.queued:
+                    self.queued.add(ghost)
+                    self.pending.append(ghost)
+                deferred += 1
+        self.decisions.append(decided)
+        self.deferred.append(deferred)
+        self.ai_times.append(time.perf_counter() - start)
+        self.total_decisions += decided
+        self.total_deferred += deferred
+
+    def stats(self):
+        frames = max(1, len(self.decisions))
+        return {
+            'decisions_per_frame': sum(self.decisions) / frames,
+            'max_decisions': max(self.decisions, default=0),
+            'deferred_per_frame': sum(self.deferred) / frames,
+            'ai_ms_p99': percentile(self.ai_times, 0.99) * 1000,
+            'total_decisions': self.total_decisions,
+            'total_deferred': self.total_deferred,
+        }
+
+    def report(self, out=None):
+        out = out or sys.stderr
+        s = self.stats()
+        print(f"[ai] {s['decisions_per_frame']:.2f} decisions/frame (max {s['max_decisions']}), "
+              f"{s['total_deferred']} deferred in total, p99 {s['ai_ms_p99']:.3f} ms per frame", file=out)
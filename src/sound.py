@@ -2,29 +2,77 @@ import pygame
 import os
 
 class SoundManager:
-    def __init__(self, sfx_path='assets/sounds', music_path='assets/music'):
+    def __init__(self, sfx_path='assets/sounds', music_path='assets/music', lazy=True):
         self.sfx_path = sfx_path
         self.music_path = music_path
         self.sfx_cache = {}
-        pygame.mixer.init()
+        self.music_loaded = None
+        self.mixer_ready = False
+        if not lazy:
+            self.init_mixer()
 
-    def play_sfx(self, name):
+    def init_mixer(self):
+        # The mixer is the slowest subsystem to bring up, so it starts on first use or an idle frame
+        if self.mixer_ready:
+            return True
+        try:
+            if not pygame.mixer.get_init():
+                pygame.mixer.init()
+            self.mixer_ready = True
+        except pygame.error:
+            self.mixer_ready = False
+        return self.mixer_ready
+
+    def load_sfx(self, name):
         if name not in self.sfx_cache:
             path = os.path.join(self.sfx_path, name)
-            if not os.path.exists(path):
+            if not os.path.exists(path) or not self.init_mixer():
                 self.sfx_cache[name] = None
-                return
-            self.sfx_cache[name] = pygame.mixer.Sound(path)
-        sfx = self.sfx_cache[name]
+            else:
+                self.sfx_cache[name] = pygame.mixer.Sound(path)
+        return self.sfx_cache[name]
+
+    def preload(self, names):
+        for name in names:
+            self.load_sfx(name)
+
+    def play_sfx(self, name):
+        sfx = self.load_sfx(name)
         if sfx:
             sfx.play()
 
-    def play_music(self, name, loop=True):
+    def load_music(self, name):
         path = os.path.join(self.music_path, name)
-        if not os.path.exists(path):
+        if not os.path.exists(path) or not self.init_mixer():
+            return False
+        if self.music_loaded != name:
+            pygame.mixer.music.load(path)
+            self.music_loaded = name
+        return True
+
+    def play_music(self, name, loop=True):
+        if not self.load_music(name):
             return
-        pygame.mixer.music.load(path)
         pygame.mixer.music.play(-1 if loop else 0)
 
     def stop_music(self):
-        pygame.mixer.music.stop() 
\ No newline at end of file
+        if self.mixer_ready:
+            pygame.mixer.music.stop()
+
+
+class NullSound:
+    # For games that share a window but shouldn't be heard, e.g. attract-mode instances
+    def init_mixer(self):
+        return False
+
+    def preload(self, names):
+        pass
+
+    def play_sfx(self, name):
+        pass
+
+    def play_music(self, name, loop=True):
+        pass
+
+    def stop_music(self):
+        pass
@@ -1,21 +1,41 @@
 import pygame
 import os
+from collections import OrderedDict
+
+# Scaled images are shared by every loader; the full-size originals are dropped once scaled.
+# Least recently used first, bounded so resizing through many cell sizes doesn't pile up copies.
+SCALED_CAPACITY = 32
+_scaled = OrderedDict()
+
+
+def decode(path):
+    if not os.path.exists(path):
+        return None
+    return pygame.image.load(path).convert_alpha()
+
+
+def get(path, size=None):
+    key = (path, size)
+    if key in _scaled:
+        _scaled.move_to_end(key)
+        return _scaled[key]
+    img = decode(path)
+    if img is not None and size:
+        img = pygame.transform.smoothscale(img, size)
+    _scaled[key] = img
+    while len(_scaled) > SCALED_CAPACITY:
+        _scaled.popitem(last=False)
+    return img
+
+
+def preload(names, size=None, base_path='assets/sprites'):
+    for name in names:
+        get(os.path.join(base_path, name), size)
+
 
 class SpriteLoader:
     def __init__(self, base_path='assets/sprites'):
         self.base_path = base_path
-        self.cache = {}
 
     def load(self, name, size=None):
-        key = (name, size)
-        if key in self.cache:
-            return self.cache[key]
-        path = os.path.join(self.base_path, name)
-        if not os.path.exists(path):
-            self.cache[key] = None
-            return None
-        img = pygame.image.load(path).convert_alpha()
-        if size:
-            img = pygame.transform.smoothscale(img, size)
-        self.cache[key] = img
-        return img 
\ No newline at end of file
+        return get(os.path.join(self.base_path, name), size)
@@ -0,0 +1,98 @@
+import builtins
+import sys
+import time
+from contextlib import contextmanager
+
+
+class StartupTrace:
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.t0 = time.perf_counter()
+        self.phases = []
+        self.imports = []
+        self._stack = []
+        self._orig_import = None
+        self._printed = 0
+        self.reported = False
+
+    @contextmanager
+    def phase(self, name):
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, time.perf_counter() - start))
+
+    def start_imports(self):
+        if not self.enabled or self._orig_import:
+            return
+        self._orig_import = builtins.__import__
+        builtins.__import__ = self._timed_import
+
+    def stop_imports(self):
+        if self._orig_import:
+            builtins.__import__ = self._orig_import
+            self._orig_import = None
+
+    def _timed_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        # Only time the first import of a module; cached lookups cost nothing
+        if level or name in sys.modules:
+            return self._orig_import(name, globals, locals, fromlist, level)
+        entry = [name, len(self._stack), time.perf_counter(), 0.0]
+        self._stack.append(entry)
+        try:
+            return self._orig_import(name, globals, locals, fromlist, level)
+        finally:
+            self._stack.pop()
+            total = time.perf_counter() - entry[2]
+            if self._stack:
+                self._stack[-1][3] += total
+            self.imports.append((name, entry[1], total, total - entry[3]))
+
+    def report(self, label='first menu frame', out=None):
+        first = not self.reported
+        self.reported = True
+        if not self.enabled:
+            return
+        self.stop_imports()
+        out = out or sys.stderr
+        total = time.perf_counter() - self.t0
+        print(f'[startup] {label} after {total*1000:.1f} ms', file=out)
+        for name, secs in self.phases[self._printed:]:
+            print(f'[startup]   phase {name:<24} {secs*1000:8.2f} ms', file=out)
+        self._printed = len(self.phases)
+        if not first:
+            return
+        slowest = sorted(self.imports, key=lambda i: i[3], reverse=True)[:15]
+        for name, depth, incl, own in slowest:
+            print(f'[startup]   import {name:<23} {own*1000:8.2f} ms self {incl*1000:8.2f} ms total (depth {depth})', file=out)
+
+
+class IdleLoader:
+    def __init__(self):
+        self.tasks = []
+
+    def add(self, name, fn):
+        self.tasks.append((name, fn))
+
+    def pending(self):
+        return bool(self.tasks)
+
+    def run(self, deadline, trace=None):
+        # Always run at least one task so loading makes progress on slow frames
+        while self.tasks:
+            name, fn = self.tasks.pop(0)
+            if trace:
+                with trace.phase(f'idle {name}'):
+                    fn()
+            else:
+                fn()
+            if time.perf_counter() >= deadline:
+                break
+
+    def flush(self, trace=None):
+        while self.tasks:
+            self.run(0, trace)
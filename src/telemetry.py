@@ -0,0 +1,169 @@
+import argparse
+import gzip
+import json
+import os
+import sys
+import threading
+import time
+from array import array
+from collections import Counter
+
+SCHEMA_VERSION = 1
+FIELDS = ('frame', 'kind', 'a', 'b', 'c')
+# Event kinds and what a/b/c carry for each
+DOT = 0            # x, y, combo count
+POWERUP = 1        # ord(kind), x, y
+FRUIT = 2          # x, y, -
+DEATH = 3          # ghost index, x, y
+GHOST_EATEN = 4    # ghost index, x, y
+LEVEL_CLEAR = 5    # level, score, frames spent on the level
+GAME_OVER = 6      # score, level, -
+FRAME_OUTLIER = 7  # frame time us, budget us, -
+KINDS = ('dot', 'powerup', 'fruit', 'death', 'ghost_eaten', 'level_clear', 'game_over', 'frame_outlier')
+
+
+class NullTelemetry:
+    frame = 0
+
+    def emit(self, kind, a=0, b=0, c=0):
+        pass
+
+    def close(self):
+        pass
+
+
+class Telemetry:
+    def __init__(self, out_dir, capacity=65536, flush_interval=0.5, meta=None):
+        self.capacity = capacity
+        self.buf = array('q', bytes(8 * len(FIELDS) * capacity))
+        self.head = 0
+        self.tail = 0
+        self.dropped = 0
+        self.frame = 0
+        self.lock = threading.Lock()
+        self.flush_interval = flush_interval
+        os.makedirs(out_dir, exist_ok=True)
+        self.path = os.path.join(out_dir, time.strftime('session-%Y%m%d-%H%M%S.ndjson.gz'))
+        self.file = gzip.open(self.path, 'wt', compresslevel=6)
+        header = {'schema': SCHEMA_VERSION, 'fields': FIELDS, 'kinds': KINDS, 'meta': meta or {}}
+        self.file.write(json.dumps(header) + '\n')
+        self.stop = threading.Event()
+        self.thread = threading.Thread(target=self._writer, daemon=True)
+        self.thread.start()
+
+    def emit(self, kind, a=0, b=0, c=0):
+        # Game thread: write into the preallocated ring, nothing else
+        with self.lock:
+            i = self.head
+            if i - self.tail >= self.capacity:
+                self.dropped += 1
+                return
+            o = (i % self.capacity) * 5
+            buf = self.buf
+            buf[o] = self.frame
+            buf[o+1] = kind
+            buf[o+2] = a
+            buf[o+3] = b
+            buf[o+4] = c
+            self.head = i + 1
+
+    def _drain(self):
+        head, tail = self.head, self.tail
+        if head == tail:
+            return
+        start = (tail % self.capacity) * 5
+        end = (head % self.capacity) * 5
+        if end > start:
+            rows = self.buf[start:end].tolist()
+        else:
+            rows = self.buf[start:].tolist() + self.buf[:end].tolist()
+        # Slots are only reused once tail moves past them
+        self.tail = head
+        self.file.write(''.join('[%d,%d,%d,%d,%d]\n' % tuple(rows[i:i+5]) for i in range(0, len(rows), 5)))
+
+    def _writer(self):
+        while not self.stop.wait(self.flush_interval):
+            self._drain()
+        self._drain()
+
+    def close(self):
+        self.stop.set()
+        self.thread.join()
+        self.file.close()
+        if self.dropped:
+            print(f'[telemetry] ring full, dropped {self.dropped} events', file=sys.stderr)
+
+
+def read_events(path, chunk_size=1 << 22):
+    # Yields (header, flat list of ints) per chunk; the fixed schema lets us skip json per line
+    strip = bytes.maketrans(b'[],', b'   ')
+    with gzip.open(path, 'rb') as f:
+        header = json.loads(f.readline())
+        rest = b''
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            chunk = rest + chunk
+            cut = chunk.rfind(b'\n') + 1
+            rest = chunk[cut:]
+            yield header, list(map(int, chunk[:cut].translate(strip).split()))
+        if rest.strip():
+            yield header, list(map(int, rest.translate(strip).split()))
+
+
+def summarize(paths):
+    kinds = Counter()
+    deaths_by_ghost = Counter()
+    powerups = Counter()
+    clears = []
+    outliers = []
+    sessions = 0
+    for path in paths:
+        sessions += 1
+        for header, vals in read_events(path):
+            names = header['kinds']
+            kind_col = vals[1::5]
+            for k, count in Counter(kind_col).items():
+                kinds[names[k]] += count
+            ghost_names = header['meta'].get('ghosts', [])
+            a_col = vals[2::5]
+            for k, a, c in zip(kind_col, a_col, vals[4::5]):
+                if k == DEATH:
+                    deaths_by_ghost[ghost_names[a] if a < len(ghost_names) else f'ghost {a}'] += 1
+                elif k == POWERUP:
+                    powerups[chr(a)] += 1
+                elif k == LEVEL_CLEAR:
+                    clears.append(c)
+                elif k == FRAME_OUTLIER:
+                    outliers.append(a)
+    total = sum(kinds.values())
+    print(f'{sessions} sessions, {total} events')
+    for name, count in kinds.most_common():
+        print(f'  {name:<14} {count}')
+    for name, count in sorted(deaths_by_ghost.items()):
+        print(f'  deaths by {name:<8} {count}')
+    for kind, count in sorted(powerups.items()):
+        print(f'  power-up {kind}     {count}')
+    if clears:
+        print(f'  mean frames per level clear {sum(clears)/len(clears):.0f}')
+    if outliers:
+        outliers.sort()
+        p = lambda q: outliers[min(len(outliers)-1, int(q*len(outliers)))] / 1000
+        print(f'  frame outliers p50 {p(0.5):.1f} ms  p99 {p(0.99):.1f} ms  max {outliers[-1]/1000:.1f} ms')
+    return kinds
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='telemetry', description='Aggregate Paxman telemetry sessions')
+    parser.add_argument('paths', nargs='+', help='session-*.ndjson.gz files')
+    args = parser.parse_args(argv)
+    start = time.perf_counter()
+    kinds = summarize(args.paths)
+    secs = time.perf_counter() - start
+    total = sum(kinds.values())
+    print(f'processed {total} events in {secs:.2f} s ({total/max(secs, 1e-9)/1e6:.2f} M events/s)')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,25 +1,14 @@
-import pygame
-import os
+from fonts import get_font
+from sprites import SpriteLoader
 
 class GameUI:
     def __init__(self, screen):
         self.screen = screen
-        font_path = 'assets/fonts/PressStart2P.ttf'
-        if os.path.exists(font_path):
-            self.font = pygame.font.Font(font_path, 28)
-            self.big_font = pygame.font.Font(font_path, 48)
-            self.small_font = pygame.font.Font(font_path, 20)
-        else:
-            self.font = pygame.font.SysFont('Arial', 32)
-            self.big_font = pygame.font.SysFont('Arial', 48)
-            self.small_font = pygame.font.SysFont('Arial', 20)
-        self.icon_life = self.load_icon('icon_life.png')
-
-    def load_icon(self, name):
-        path = os.path.join('assets/sprites', name)
-        if os.path.exists(path):
-            return pygame.transform.smoothscale(pygame.image.load(path).convert_alpha(), (32, 32))
-        return None
+        self.font = get_font(28, fallback_size=32)
+        self.big_font = get_font(48)
+        self.small_font = get_font(20)
+        # Through the shared sprite cache, so every reset and every instance reuses one icon
+        self.icon_life = SpriteLoader().load('icon_life.png', (32, 32))
 
     def draw(self, score, high_score, lives, map_rect, level=1):
         w = self.screen.get_width()
@@ -0,0 +1,278 @@
+from collections import deque
+
+import numpy as np
+
+from level import compile_level, DIRS
+from ghost import GHOST_TYPES, SCATTER_TARGETS
+
+# Action 0 keeps the current heading, 1..4 request a turn in DIRS order (right, left, down, up)
+ACTIONS = ('noop', 'right', 'left', 'down', 'up')
+CHANNELS = ('walls', 'dots', 'powerups', 'ghosts', 'player')
+GHOST_SPEED = {'Easy': 30, 'Normal': 15, 'Hard': 8}
+# One env step moves the player one tile; Player.speed is 0.18 tiles per frame
+FRAMES_PER_STEP = 1 / 0.18
+POWERUP_CODES = {'T': 1, 'S': 2, 'I': 3}
+
+
+def _frames(n):
+    return max(1, int(round(n / FRAMES_PER_STEP)))
+
+
+class VectorEnv:
+    def __init__(self, num_envs, level_path='levels/level1.json', difficulty='Normal', seed=None,
+                 max_steps=2000, death_penalty=0.0, lives=3):
+        self.num_envs = num_envs
+        self.max_steps = max_steps
+        self.death_penalty = death_penalty
+        self.start_lives = lives
+        self.rng = np.random.default_rng(seed)
+        self.level = compile_level(level_path)
+        self._build_tables()
+        self.ghost_rate = FRAMES_PER_STEP / GHOST_SPEED[difficulty]
+        self.num_ghosts = len(GHOST_TYPES)
+        n, c, g = num_envs, self.num_cells, self.num_ghosts
+        self.player = np.empty(n, np.int32)
+        self.pdir = np.empty(n, np.int8)
+        self.next_dir = np.empty(n, np.int8)
+        self.ghosts = np.empty((n, g), np.int32)
+        self.eaten = np.empty((n, g), bool)
+        self.dots = np.empty((n, c), bool)
+        self.power = np.empty((n, c), np.int8)
+        self.lives = np.empty(n, np.int32)
+        self.score = np.empty(n, np.int64)
+        self.steps = np.empty(n, np.int32)
+        self.dots_eaten = np.empty(n, np.int32)
+        self.invincible = np.empty(n, np.int32)
+        self.speed_timer = np.empty(n, np.int32)
+        self.invuln = np.empty(n, np.int32)
+        self.chase = np.empty(n, bool)
+        self.mode_timer = np.empty(n, np.int32)
+        self.ghost_acc = np.empty(n, np.float64)
+        self.fruit_timer = np.empty(n, np.int32)
+        self.fruit_spawned = np.empty(n, bool)
+        self._rows = np.arange(n)
+        self._obs = np.zeros((n, len(CHANNELS), self.level.rows * self.level.cols), np.uint8)
+        self._obs[:, 0] = self.wall_mask
+
+    def _build_tables(self):
+        level = self.level
+        h, w = level.rows, level.cols
+        cells = sorted(level.walkable, key=lambda p: (p[1], p[0]))
+        index = {p: i for i, p in enumerate(cells)}
+        self.num_cells = c = len(cells)
+        self.cell_xy = np.array(cells, np.int32).reshape(-1, 2)
+        self.flat = self.cell_xy[:, 1] * w + self.cell_xy[:, 0]
+        self.wall_mask = np.ones(h * w, np.uint8)
+        self.wall_mask[self.flat] = 0
+        # nbr[cell, d] is the cell reached by moving in DIRS[d], or -1 for a wall
+        self.nbr = np.full((c, len(DIRS)), -1, np.int32)
+        for i, (x, y) in enumerate(cells):
+            for d, (dx, dy) in enumerate(DIRS):
+                j = index.get((x+dx, y+dy))
+                if j is not None:
+                    self.nbr[i, d] = j
+        # All-pairs BFS distances; fine for training-sized mazes (a few thousand cells)
+        unreachable = np.iinfo(np.int32).max // 2
+        self.dist = np.full((c, c), unreachable, np.int32)
+        adjacency = [[j for j in row if j >= 0] for row in self.nbr.tolist()]
+        for src in range(c):
+            d = self.dist[src]
+            d[src] = 0
+            frontier = [src]
+            depth = 0
+            while frontier:
+                depth += 1
+                nxt = []
+                for u in frontier:
+                    for v in adjacency[u]:
+                        if d[v] == unreachable:
+                            d[v] = depth
+                            nxt.append(v)
+                frontier = nxt
+        # Targets off the walkable set (walls, clamped look-ahead) snap to the closest open cell
+        self.nearest = np.full((h, w), -1, np.int32)
+        queue = deque(cells)
+        for i, (x, y) in enumerate(cells):
+            self.nearest[y, x] = i
+        while queue:
+            x, y = queue.popleft()
+            for dx, dy in DIRS:
+                nx, ny = x + dx, y + dy
+                if 0 <= nx < w and 0 <= ny < h and self.nearest[ny, nx] < 0:
+                    self.nearest[ny, nx] = self.nearest[y, x]
+                    queue.append((nx, ny))
+        self.dot_init = np.zeros(c, bool)
+        self.dot_init[[index[p] for p in level.dots]] = True
+        self.power_init = np.zeros(c, np.int8)
+        for p, kind in level.powerups.items():
+            self.power_init[index[p]] = POWERUP_CODES[kind]
+        self.player_start = index.get(level.player_start, 0)
+        self.ghost_home = index.get(level.ghost_start, 0)
+        self.scatter = np.array([self.nearest[min(max(ty, 0), h-1), min(max(tx, 0), w-1)]
+                                 for tx, ty in (SCATTER_TARGETS[name](level.grid) for name, _ in GHOST_TYPES)],
+                                np.int32)
+        self.fruit_cell = index.get((w // 2, h // 2), -1)
+
+    def reset(self, mask=None):
+        self._reset(self._rows if mask is None else np.flatnonzero(mask))
+        return self.observe()
+
+    def _reset(self, idx):
+        if len(idx) == 0:
+            return
+        self.player[idx] = self.player_start
+        self.pdir[idx] = -1
+        self.next_dir[idx] = -1
+        self.ghosts[idx] = self.ghost_home
+        self.eaten[idx] = False
+        self.dots[idx] = self.dot_init
+        self.power[idx] = self.power_init
+        self.lives[idx] = self.start_lives
+        self.score[idx] = 0
+        self.steps[idx] = 0
+        self.dots_eaten[idx] = 0
+        self.invincible[idx] = 0
+        self.speed_timer[idx] = 0
+        self.invuln[idx] = 0
+        self.chase[idx] = False
+        self.mode_timer[idx] = 420
+        self.ghost_acc[idx] = 0.0
+        self.fruit_timer[idx] = 0
+        self.fruit_spawned[idx] = False
+
+    def observe(self):
+        obs = self._obs
+        obs[:, 1:] = 0
+        obs[:, 1, self.flat] = self.dots
+        obs[:, 2, self.flat] = self.power > 0
+        rows = self._rows[:, None]
+        obs[rows, 3, self.flat[self.ghosts]] = 1
+        obs[self._rows, 4, self.flat[self.player]] = 1
+        return obs.reshape(self.num_envs, len(CHANNELS), self.level.rows, self.level.cols).copy()
+
+    def _move_player(self, rewards, active):
+        rows = self._rows
+        want = self.next_dir
+        turn = active & (want >= 0) & (self.nbr[self.player, np.maximum(want, 0)] >= 0)
+        self.pdir = np.where(turn, want, self.pdir)
+        ahead = self.nbr[self.player, np.maximum(self.pdir, 0)]
+        move = active & (self.pdir >= 0) & (ahead >= 0)
+        self.player = np.where(move, ahead, self.player)
+        # Dots, power-ups and fruit on the tile just entered
+        dot = move & self.dots[rows, self.player]
+        self.dots[rows[dot], self.player[dot]] = False
+        rewards += dot * 10
+        self.dots_eaten += dot
+        kind = np.where(move, self.power[rows, self.player], 0)
+        got = kind > 0
+        self.power[rows[got], self.player[got]] = 0
+        self.speed_timer = np.where(kind == POWERUP_CODES['S'], _frames(180), self.speed_timer)
+        self.invincible = np.where(kind == POWERUP_CODES['I'], _frames(180), self.invincible)
+        fruit = move & (self.fruit_timer > 0) & (self.player == self.fruit_cell)
+        rewards += fruit * 300
+        self.fruit_timer = np.where(fruit, 0, self.fruit_timer)
+
+    def _ghost_targets(self):
+        h, w = self.level.rows, self.level.cols
+        pxy = self.cell_xy[self.player]
+        pd = np.array(DIRS + [(0, 0)], np.int32)[self.pdir]
+        targets = np.empty((self.num_envs, self.num_ghosts), np.int32)
+        scatter = np.broadcast_to(self.scatter, targets.shape)
+        ahead4 = pxy + 4 * pd
+        pinky = self.nearest[np.clip(ahead4[:, 1], 0, h-1), np.clip(ahead4[:, 0], 0, w-1)]
+        bxy = self.cell_xy[self.ghosts[:, 0]]
+        inky_xy = 2 * (pxy + 2 * pd) - bxy
+        inky = self.nearest[np.clip(inky_xy[:, 1], 0, h-1), np.clip(inky_xy[:, 0], 0, w-1)]
+        cxy = self.cell_xy[self.ghosts[:, 3]]
+        clyde = np.where(((cxy - pxy) ** 2).sum(1) > 64, self.player, self.scatter[3])
+        chase = np.stack([self.player, pinky, inky, clyde], 1)
+        targets[:] = np.where(self.chase[:, None], chase, scatter)
+        return np.where(self.eaten, self.ghost_home, targets)
+
+    def _move_ghosts(self, active):
+        # Every env whose ghosts are due this step moves all its ghosts at once
+        moving = active & (self.ghost_acc >= 1.0)
+        self.ghost_acc -= moving
+        if not moving.any():
+            return
+        self.mode_timer -= moving
+        flip = moving & (self.mode_timer <= 0)
+        self.chase = np.where(flip, ~self.chase, self.chase)
+        self.mode_timer = np.where(flip, np.where(self.chase, 1740, 420), self.mode_timer)
+        cand = self.nbr[self.ghosts]
+        valid = cand >= 0
+        targets = self._ghost_targets()
+        cost = np.where(valid, self.dist[np.maximum(cand, 0), targets[..., None]], np.iinfo(np.int32).max)
+        chosen = cost.argmin(-1)
+        frightened = (self.invincible > 0)[:, None] & ~self.eaten
+        noise = np.where(valid, self.rng.random(cand.shape), -1.0)
+        chosen = np.where(frightened, noise.argmax(-1), chosen)
+        step = np.take_along_axis(cand, chosen[..., None], -1)[..., 0]
+        step = np.where(step >= 0, step, self.ghosts)
+        self.ghosts = np.where(moving[:, None], step, self.ghosts)
+        self.eaten &= self.ghosts != self.ghost_home
+
+    def step(self, actions):
+        actions = np.asarray(actions)
+        rewards = np.zeros(self.num_envs, np.float32)
+        self.next_dir = np.where(actions > 0, actions - 1, self.next_dir).astype(np.int8)
+        before = self.player.copy()
+        ghosts_before = self.ghosts.copy()
+        alive = np.ones(self.num_envs, bool)
+        self._move_player(rewards, alive)
+        self._move_player(rewards, self.speed_timer > 0)
+        self.ghost_acc += self.ghost_rate
+        self._move_ghosts(alive)
+        self.score += rewards.astype(np.int64)
+        # A collision is sharing a tile or swapping tiles with a ghost this step
+        hit = (self.ghosts == self.player[:, None]) | (
+            (self.ghosts == before[:, None]) & (ghosts_before == self.player[:, None]))
+        hit &= ~self.eaten
+        invincible = (self.invincible > 0)[:, None]
+        self.eaten |= hit & invincible
+        died = (hit & ~invincible).any(1) & (self.invuln == 0)
+        self.lives -= died
+        # The penalty is a positive cost taken off the reward
+        rewards -= died * self.death_penalty
+        self.player = np.where(died, self.player_start, self.player)
+        self.pdir = np.where(died, -1, self.pdir)
+        self.next_dir = np.where(died, -1, self.next_dir)
+        self.invuln = np.where(died, _frames(120), np.maximum(self.invuln - 1, 0))
+        self.invincible = np.maximum(self.invincible - 1, 0)
+        self.speed_timer = np.maximum(self.speed_timer - 1, 0)
+        spawn = ~self.fruit_spawned & (self.dots_eaten >= 30) & (self.fruit_cell >= 0)
+        self.fruit_spawned |= spawn
+        self.fruit_timer = np.where(spawn, _frames(600), np.maximum(self.fruit_timer - 1, 0))
+        self.steps += 1
+        cleared = ~self.dots.any(1)
+        truncated = self.steps >= self.max_steps
+        dones = (self.lives <= 0) | cleared | truncated
+        infos = {'score': self.score.copy(), 'cleared': cleared, 'truncated': truncated & ~cleared & (self.lives > 0)}
+        # Finished envs start over immediately, as in gym's vector API
+        self._reset(np.flatnonzero(dones))
+        return self.observe(), rewards, dones, infos
+
+
+def main(argv=None):
+    import argparse
+    import time
+    parser = argparse.ArgumentParser(prog='vecenv', description='Measure VectorEnv throughput with random actions')
+    parser.add_argument('--envs', type=int, default=1024)
+    parser.add_argument('--level', default='levels/level1.json')
+    parser.add_argument('--seconds', type=float, default=3.0)
+    args = parser.parse_args(argv)
+    env = VectorEnv(args.envs, args.level, seed=0)
+    env.reset()
+    rng = np.random.default_rng(0)
+    steps = episodes = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < args.seconds:
+        _, _, dones, _ = env.step(rng.integers(0, len(ACTIONS), args.envs))
+        steps += 1
+        episodes += int(dones.sum())
+    secs = time.perf_counter() - start
+    print(f'{args.envs} envs: {steps * args.envs / secs:,.0f} env-steps/s, {episodes} episodes finished')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,36 @@
+import math
+import pygame
+
+GAP_COLOR = (60, 60, 90)
+FOCUS_COLOR = (0, 255, 255)
+
+
+class ViewportCompositor:
+    # Tiles N games across one window; each game draws straight into its own subsurface
+    def __init__(self, count, gap=4):
+        self.count = count
+        self.gap = gap
+        self.rects = []
+
+    def layout(self, screen):
+        w, h = screen.get_size()
+        cols = math.ceil(math.sqrt(self.count))
+        rows = math.ceil(self.count / cols)
+        cw = max(1, (w - self.gap*(cols-1)) // cols)
+        ch = max(1, (h - self.gap*(rows-1)) // rows)
+        self.rects = [pygame.Rect((i % cols)*(cw + self.gap), (i // cols)*(ch + self.gap), cw, ch)
+                      for i in range(self.count)]
+        return [screen.subsurface(rect) for rect in self.rects]
+
+    def attach(self, screen, games):
+        # Games repaint their own viewports every frame; the gaps only need painting here
+        screen.fill(GAP_COLOR)
+        for game, view in zip(games, self.layout(screen)):
+            game.set_screen(view)
+
+    def draw(self, screen, games, focus=0):
+        for game in games:
+            game.draw()
+        # Outline the keyboard-controlled viewports
+        for rect in self.rects[:focus]:
+            pygame.draw.rect(screen, FOCUS_COLOR, rect, 2)
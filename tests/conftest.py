@@ -0,0 +1,23 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+LEVEL1 = os.path.join(ROOT, 'levels', 'level1.json')
+
+
+@pytest.fixture
+def game(monkeypatch):
+    import pygame
+    from game import Game
+    monkeypatch.chdir(ROOT)
+    pygame.init()
+    game = Game(pygame.display.set_mode((480, 360)))
+    game.start_timer = 0
+    return game
@@ -0,0 +1,25 @@
+import os
+
+import pygame
+
+import sprites
+from conftest import LEVEL1, ROOT
+from level import WALL_LAYERS, compile_level
+
+
+def test_wall_layers_are_bounded():
+    level = compile_level(LEVEL1)
+    for cell in range(8, 40):
+        level.wall_layer(cell)
+    assert len(level._wall_layers) == WALL_LAYERS
+    assert level.wall_layer(39).get_size() == (level.cols * 39, level.rows * 39)
+
+
+def test_scaled_sprites_are_bounded():
+    if not pygame.display.get_surface():
+        pygame.display.init()
+        pygame.display.set_mode((1, 1))
+    path = os.path.join(ROOT, 'assets', 'sprites', 'ghost_red.png')
+    for cell in range(8, 8 + 2 * sprites.SCALED_CAPACITY):
+        assert sprites.get(path, (cell, cell)).get_size() == (cell, cell)
+    assert len(sprites._scaled) == sprites.SCALED_CAPACITY
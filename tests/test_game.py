@@ -0,0 +1,28 @@
+import pytest
+
+import config
+
+
+def test_restart_starts_over_at_level_one(game):
+    speed = game.ghost_speed
+    game.level = 3
+    game.ghost_speed = 6
+    game.score = 1234
+    game.game_over = True
+    game.restart()
+    assert game.level == 1
+    assert game.ghost_speed == speed
+    assert all(ghost.speed == speed for ghost in game.ghosts)
+    assert game.score == 0 and not game.game_over
+    assert game.map.level.path == game.campaign.path_for(1)
+
+
+@pytest.mark.parametrize('flag', [['--pipeline'], ['--telemetry', 'out'], ['--capture', 'out'], ['--measure-latency']])
+def test_instances_reject_unsupported_flags(flag, capsys):
+    with pytest.raises(SystemExit):
+        config.parse_args(['--instances', '2'] + flag)
+    assert '--instances' in capsys.readouterr().err
+
+
+def test_single_instance_keeps_those_flags():
+    assert config.parse_args(['--pipeline']).pipeline
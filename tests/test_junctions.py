@@ -0,0 +1,57 @@
+import random
+from collections import deque
+
+from conftest import LEVEL1
+from level import CompiledLevel, compile_level
+
+LOOP = [
+    '#######',
+    '#P....#',
+    '#.###.#',
+    '#....G#',
+    '#######',
+]
+
+
+def distances(level, start):
+    dist = {start: 0}
+    queue = deque([start])
+    while queue:
+        tile = queue.popleft()
+        for nxt in level.neighbors[tile]:
+            if nxt not in dist:
+                dist[nxt] = dist[tile] + 1
+                queue.append(nxt)
+    return dist
+
+
+def check_pairs(level, pairs):
+    # next_step may break ties differently from BFS, but it must always be one step shorter
+    for start, target in pairs:
+        step = level.junctions.next_step(start, target)
+        if start == target:
+            assert step is None
+            continue
+        dist = distances(level, target)
+        assert step in level.neighbors[start]
+        assert dist[step] == dist[start] - 1
+
+
+def test_next_step_matches_bfs_on_level1():
+    level = compile_level(LEVEL1)
+    tiles = sorted(distances(level, level.player_start))
+    rng = random.Random(0)
+    check_pairs(level, [(rng.choice(tiles), rng.choice(tiles)) for _ in range(500)])
+
+
+def test_next_step_matches_bfs_on_junctionless_loop():
+    level = CompiledLevel('loop', {'grid': LOOP})
+    assert all(len(nb) == 2 for nb in level.neighbors.values())
+    assert len(level.junctions.nodes) == 1
+    tiles = sorted(level.walkable)
+    check_pairs(level, [(a, b) for a in tiles for b in tiles])
+
+
+def test_next_step_from_off_the_maze_is_none():
+    level = CompiledLevel('loop', {'grid': LOOP})
+    assert level.junctions.next_step((0, 0), (1, 1)) is None
@@ -0,0 +1,26 @@
+import mazegen
+
+
+def test_generated_mazes_validate():
+    for seed in range(3):
+        assert mazegen.validate(mazegen.generate(41, 31, seed)) == []
+        assert mazegen.validate(mazegen.generate(41, 31, seed, symmetric=True)) == []
+
+
+def test_walled_off_dot_is_flagged():
+    grid = [
+        '#######',
+        '#P..#.#',
+        '#G..###',
+        '#######',
+    ]
+    assert mazegen.validate(grid) == ['1 dots or power-ups cannot be reached from P']
+
+
+def test_missing_ghost_start_is_flagged():
+    grid = [
+        '#####',
+        '#P..#',
+        '#####',
+    ]
+    assert 'no ghost start (G)' in mazegen.validate(grid)
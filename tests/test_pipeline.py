@@ -0,0 +1,45 @@
+from pipeline import SimPipeline
+
+
+def mirror_matches(game, snap):
+    grid = game.map.grid
+    for y in range(len(grid)):
+        for x in range(len(grid[0])):
+            assert game.map.has_dot(x, y, snap.dots) == game.map.has_dot(x, y), (x, y)
+    assert snap.powerups == game.map.powerups
+
+
+def test_mirror_follows_eaten_dots(game):
+    pipe = SimPipeline(game)
+    snap = pipe.pause()
+    pipe._mirror(snap)
+    try:
+        game.player.request_turn((1, 0))
+        for _ in range(30):
+            game.update()
+        assert game.dots_eaten
+        mirror_matches(game, pipe._mirror(game.snapshot()))
+    finally:
+        pipe.resume(snap)
+        pipe.close()
+
+
+def test_level_clear_does_not_carry_the_last_dot_over(game):
+    pipe = SimPipeline(game)
+    snap = pipe.pause()
+    pipe._mirror(snap)
+    try:
+        last = (1, 2)
+        for x, y in game.map.level.dots:
+            if (x, y) != last:
+                game.map.eat_dot(x, y)
+        game.player.x, game.player.y = last
+        game.player.fx, game.player.fy = map(float, last)
+        game.update()
+        assert game.level == 2
+        # The new level has a dot on the tile the old level's last dot was eaten from
+        assert game.map.has_dot(*last)
+        mirror_matches(game, pipe._mirror(game.snapshot()))
+    finally:
+        pipe.resume(snap)
+        pipe.close()
@@ -0,0 +1,76 @@
+import pygame
+import pytest
+
+from level import CompiledLevel
+from map import GameMap
+from player import Player
+
+# A junction at (3, 1): the corridor along row 1 can turn down into column 3
+GRID = [
+    '#######',
+    '#P....#',
+    '#.#.#.#',
+    '#.....#',
+    '#######',
+]
+
+
+@pytest.fixture
+def game_map():
+    if not pygame.display.get_surface():
+        pygame.display.init()
+        pygame.display.set_mode((1, 1))
+    return GameMap(level=CompiledLevel('t', {'grid': GRID}), cell_size=4)
+
+
+def run_until(player, done, frames=60):
+    for _ in range(frames):
+        player.update()
+        if done(player):
+            return True
+    return False
+
+
+def heading_right(game_map, turn_buffer=0):
+    player = Player(game_map, turn_buffer=turn_buffer)
+    player.request_turn((1, 0))
+    assert run_until(player, lambda p: p.x == 2)
+    return player
+
+
+def test_turn_waits_until_it_can_be_taken(game_map):
+    player = heading_right(game_map)
+    player.request_turn((0, 1))
+    player.update()
+    # A wall below (2, 1): keep going right and turn at the junction
+    assert player.dir == (1, 0)
+    assert run_until(player, lambda p: (p.x, p.y) == (3, 2))
+    assert player.dir == (0, 1)
+
+
+def test_buffered_turn_expires(game_map):
+    player = heading_right(game_map, turn_buffer=3)
+    player.request_turn((0, 1))
+    for _ in range(3):
+        player.update()
+    assert player.next_dir == (1, 0)
+    assert run_until(player, lambda p: p.x == 4)
+    assert player.y == 1
+
+
+def test_turn_just_past_a_junction_is_taken_there(game_map):
+    player = heading_right(game_map)
+    assert run_until(player, lambda p: p.x == 3 and p.fx > 3.3)
+    player.request_turn((0, 1))
+    assert run_until(player, lambda p: (p.x, p.y) == (3, 2))
+
+
+def test_late_turn_never_pulls_the_player_back(game_map):
+    player = heading_right(game_map)
+    assert run_until(player, lambda p: p.x == 4)
+    player.request_turn((0, 1))
+    for _ in range(30):
+        player.update()
+        assert player.x >= 4
+    # Taken at the next opening instead
+    assert player.x == 5 and player.y >= 2
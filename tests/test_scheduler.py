@@ -0,0 +1,73 @@
+import random
+
+import pygame
+
+import mazegen
+from conftest import LEVEL1
+from ghost import Ghost, GHOST_TYPES
+from level import CompiledLevel, compile_level
+from map import GameMap
+from player import Player
+from scheduler import GhostScheduler
+
+
+def run_ghosts(level, count, frames, budget):
+    if not pygame.display.get_surface():
+        pygame.display.init()
+        pygame.display.set_mode((1, 1))
+    random.seed(0)
+    game_map = GameMap(level=level, cell_size=4)
+    player = Player(game_map)
+    ghosts = []
+    for i in range(count):
+        name, color = GHOST_TYPES[i % len(GHOST_TYPES)]
+        ghosts.append(Ghost(game_map, color, ghost_type=name, blinky_ref=ghosts[0] if ghosts else None))
+    scheduler = GhostScheduler(budget)
+    scheduler.stagger(ghosts)
+    for _ in range(frames):
+        due = [(ghost.frame + 1) % ghost.speed == 0 for ghost in ghosts]
+        before = [(ghost.x, ghost.y) for ghost in ghosts]
+        scheduler.update(ghosts, player)
+        for ghost, moved, tile in zip(ghosts, due, before):
+            if moved:
+                assert (ghost.x, ghost.y) != tile
+    return scheduler
+
+
+def test_no_ghost_stalls_on_level1():
+    scheduler = run_ghosts(compile_level(LEVEL1), 16, 600, budget=0.0)
+    assert scheduler.total_deferred > 0
+
+
+def test_no_ghost_stalls_in_a_large_maze():
+    level = CompiledLevel('maze', {'grid': mazegen.generate(61, 61, seed=3)})
+    scheduler = run_ghosts(level, 32, 300, budget=0.0)
+    assert scheduler.total_deferred > 0
+
+
+def test_ghost_starting_on_a_wall_steps_onto_the_maze():
+    # No G, so ghosts fall back to (5, 5), which is a wall here
+    grid = [
+        '#########',
+        '#P......#',
+        '#.#####.#',
+        '#.......#',
+        '#.#####.#',
+        '#....#..#',
+        '#########',
+    ]
+    level = CompiledLevel('no-g', {'grid': grid})
+    assert level.ghost_start == (5, 5) and (5, 5) not in level.walkable
+    if not pygame.display.get_surface():
+        pygame.display.init()
+        pygame.display.set_mode((1, 1))
+    for budget in (None, 0.0):
+        game_map = GameMap(level=level, cell_size=4)
+        player = Player(game_map)
+        ghost = Ghost(game_map, GHOST_TYPES[0][1], ghost_type='blinky')
+        ghost.frame = ghost.speed - 1
+        if budget is None:
+            ghost.update(player)
+        else:
+            GhostScheduler(budget).update([ghost], player)
+        assert (ghost.x, ghost.y) in level.walkable
@@ -0,0 +1,53 @@
+import numpy as np
+
+from conftest import LEVEL1
+from vecenv import CHANNELS, VectorEnv
+
+
+def test_reset_shapes_and_dots():
+    env = VectorEnv(4, LEVEL1, seed=0)
+    obs = env.reset()
+    rows, cols = env.level.rows, env.level.cols
+    assert obs.shape == (4, len(CHANNELS), rows, cols)
+    assert obs.dtype == np.uint8
+    assert (obs[:, 1].reshape(4, -1).sum(1) == len(env.level.dots)).all()
+    assert (obs[:, 4].reshape(4, -1).sum(1) == 1).all()
+
+
+def test_step_rewards_match_dots_eaten():
+    env = VectorEnv(8, LEVEL1, seed=1)
+    env.reset()
+    rng = np.random.default_rng(1)
+    left = env.dots.sum(1)
+    # Fewer than 30 dots can go in 12 steps, so no fruit spawns to add its 300
+    for _ in range(12):
+        obs, rewards, dones, infos = env.step(rng.integers(0, 5, 8))
+        assert obs.shape == (8, len(CHANNELS), env.level.rows, env.level.cols)
+        assert rewards.shape == dones.shape == (8,)
+        now = env.dots.sum(1)
+        assert (obs[:, 1].reshape(8, -1).sum(1) == now).all()
+        live = ~dones
+        assert (rewards[live] == 10 * (left - now)[live]).all()
+        left = now
+
+
+def test_reset_mask_only_touches_masked_envs():
+    env = VectorEnv(2, LEVEL1, seed=2)
+    env.reset()
+    for _ in range(10):
+        env.step([1, 1])
+    eaten = env.dots.sum(1)
+    env.reset(np.array([True, False]))
+    assert env.dots[0].sum() == len(env.level.dots)
+    assert env.dots[1].sum() == eaten[1]
+
+
+def test_death_penalty_is_subtracted():
+    env = VectorEnv(1, LEVEL1, seed=3, death_penalty=100.0)
+    env.reset()
+    # Put a ghost on the tile the player is about to stay on
+    env.ghosts[0, 0] = env.player[0]
+    env.invuln[:] = 0
+    obs, rewards, dones, infos = env.step([0])
+    assert env.lives[0] == 2
+    assert rewards[0] <= -100